@@ -4,10 +4,33 @@ including user management, voter registration, election scheduling, and voting f
 """
 
 import os
-from datetime import datetime
+import csv
+import gzip
+import hashlib
+import io
+import itertools
+import json
+import math
+import mimetypes
+import marshal
+import multiprocessing
+import cProfile
+import pstats
+import random
+import re
+import threading
+import time
+import zlib
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from functools import wraps
-from flask import Flask, request, jsonify, render_template, session, redirect, url_for
+import click
+from flask import Flask, Response, abort, g, has_app_context, request, jsonify, make_response, render_template, session, redirect, url_for, stream_with_context
 from flask_pymongo import PyMongo
+from pymongo import ASCENDING, DESCENDING, DeleteOne, MongoClient, UpdateOne, monitoring
+from pymongo.errors import BulkWriteError, DuplicateKeyError, PyMongoError
+from bson.errors import InvalidId
 from bson.objectid import ObjectId
 from dotenv import load_dotenv
 
@@ -17,10 +40,102 @@ load_dotenv()
 app = Flask(__name__)
 app.secret_key = 'your_secret_key'
 
+class MongoCommandTimer(monitoring.CommandListener):
+    """
+    Adds up the time spent in MongoDB commands on threads that are being profiled.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def start(self):
+        self._local.seconds = 0.0
+        self._local.commands = 0
+        self._local.active = True
+
+    def stop(self):
+        self._local.active = False
+        return self._local.seconds, self._local.commands
+
+    def _record(self, event):
+        if getattr(self._local, "active", False):
+            self._local.seconds += event.duration_micros / 1e6
+            self._local.commands += 1
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self._record(event)
+
+    def failed(self, event):
+        self._record(event)
+
+mongo_timer = MongoCommandTimer()
+
 # Configure MongoDB
 app.config["MONGO_URI"] = os.getenv("MONGO_URI")
 app.config["MONGO_DBNAME"] = "evote"
-mongo = PyMongo(app)
+mongo = PyMongo(app, event_listeners=[mongo_timer])
+
+# Export streaming: documents fetched per cursor batch and bytes buffered per response chunk
+app.config["EXPORT_BATCH_SIZE"] = int(os.getenv("EXPORT_BATCH_SIZE", 1000))
+app.config["EXPORT_CHUNK_SIZE"] = int(os.getenv("EXPORT_CHUNK_SIZE", 64 * 1024))
+
+# Upper bound on the number of records a single bulk admin request may touch
+app.config["BULK_MAX_ITEMS"] = int(os.getenv("BULK_MAX_ITEMS", 1000))
+
+# How long, and how many, vote outcomes are remembered per Idempotency-Key
+app.config["IDEMPOTENCY_TTL_SECONDS"] = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", 900))
+app.config["IDEMPOTENCY_CACHE_SIZE"] = int(os.getenv("IDEMPOTENCY_CACHE_SIZE", 10000))
+# How long a retry waits on an attempt still in flight, and after how long such an attempt is presumed dead
+app.config["IDEMPOTENCY_WAIT_SECONDS"] = float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", 5.0))
+app.config["IDEMPOTENCY_PENDING_SECONDS"] = int(os.getenv("IDEMPOTENCY_PENDING_SECONDS", 30))
+
+# Admission control for the hot voting routes: concurrency per route and per worker,
+# a bounded wait queue, and a token bucket per session
+app.config["ADMISSION_VOTE_CONCURRENCY"] = int(os.getenv("ADMISSION_VOTE_CONCURRENCY", 32))
+app.config["ADMISSION_RESULTS_CONCURRENCY"] = int(os.getenv("ADMISSION_RESULTS_CONCURRENCY", 16))
+app.config["ADMISSION_MAX_CONCURRENCY"] = int(os.getenv("ADMISSION_MAX_CONCURRENCY", 32))
+app.config["ADMISSION_MAX_QUEUE"] = int(os.getenv("ADMISSION_MAX_QUEUE", 64))
+app.config["ADMISSION_QUEUE_TIMEOUT"] = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", 2.0))
+app.config["SESSION_RATE_PER_SECOND"] = float(os.getenv("SESSION_RATE_PER_SECOND", 2.0))
+app.config["SESSION_RATE_BURST"] = int(os.getenv("SESSION_RATE_BURST", 10))
+
+# Worker processes used by the tally audit; each one recounts a range of ballot ids
+app.config["AUDIT_WORKERS"] = int(os.getenv("AUDIT_WORKERS", os.cpu_count() or 1))
+
+# Request profiling: fraction of requests sampled, and the X-Profile header value that
+# turns profiling on for a single request (admin sessions may use any value)
+app.config["PROFILE_SAMPLE_RATE"] = float(os.getenv("PROFILE_SAMPLE_RATE", 0.0))
+app.config["PROFILE_TOKEN"] = os.getenv("PROFILE_TOKEN")
+
+# Pre-election warm-up: how far ahead of start_date each worker preloads an election,
+# how often it looks, how long cached schedules stay fresh and how many connections to open
+app.config["WARMUP_ENABLED"] = os.getenv("WARMUP_ENABLED", "1") == "1"
+app.config["WARMUP_LEAD_SECONDS"] = int(os.getenv("WARMUP_LEAD_SECONDS", 300))
+app.config["WARMUP_POLL_SECONDS"] = int(os.getenv("WARMUP_POLL_SECONDS", 20))
+app.config["WARMUP_CONNECTIONS"] = int(os.getenv("WARMUP_CONNECTIONS", 8))
+app.config["ELECTION_CACHE_TTL"] = int(os.getenv("ELECTION_CACHE_TTL", 60))
+
+# Page size limits for the voter and candidate search endpoints
+app.config["SEARCH_PAGE_SIZE"] = int(os.getenv("SEARCH_PAGE_SIZE", 20))
+app.config["SEARCH_MAX_PAGE_SIZE"] = int(os.getenv("SEARCH_MAX_PAGE_SIZE", 100))
+
+# Sharded vote counters: the largest K an election may be created with, and how long
+# a summed tally is reused before the counter documents are aggregated again
+app.config["MAX_COUNTER_SHARDS"] = int(os.getenv("MAX_COUNTER_SHARDS", 64))
+app.config["RESULTS_CACHE_TTL"] = float(os.getenv("RESULTS_CACHE_TTL", 2.0))
+
+# In-process "already voted" filter: "set" answers exactly, "bloom" uses a fixed-size
+# Bloom filter per election whose positives are confirmed against the database.
+# An exact set that grows past the exact limit is swapped for a Bloom filter, and
+# only the most recently written elections are kept per worker.
+app.config["VOTED_FILTER_MODE"] = os.getenv("VOTED_FILTER_MODE", "set")
+app.config["VOTED_FILTER_CAPACITY"] = int(os.getenv("VOTED_FILTER_CAPACITY", 1000000))
+app.config["VOTED_FILTER_ERROR_RATE"] = float(os.getenv("VOTED_FILTER_ERROR_RATE", 0.01))
+app.config["VOTED_FILTER_EXACT_LIMIT"] = int(os.getenv("VOTED_FILTER_EXACT_LIMIT", 100000))
+app.config["VOTED_FILTER_MAX_ELECTIONS"] = int(os.getenv("VOTED_FILTER_MAX_ELECTIONS", 8))
 
 # #Initialize admin user
 # @app.before_first_request
@@ -52,6 +167,359 @@ def admin_required(f):
         return f(*args, **kwargs)
     return decorated_function
 
+REQUIRED_INDEXES = [
+    ("elections", [("candidates._id", ASCENDING)], {}),
+    ("elections", [("start_date", ASCENDING), ("end_date", ASCENDING)], {}),
+    ("vote_requests", [("created_at", ASCENDING)], {"expireAfterSeconds": app.config["IDEMPOTENCY_TTL_SECONDS"]}),
+    ("ballots", [("election_id", ASCENDING), ("voter_id", ASCENDING)], {"unique": True}),
+    ("ballots", [("election_id", ASCENDING), ("_id", ASCENDING)], {}),
+    ("vote_counters", [("election_id", ASCENDING)], {}),
+    ("voters", [("cnic", ASCENDING), ("_id", ASCENDING)], {}),
+    ("voters", [("search_tokens", ASCENDING)], {}),
+    ("candidates", [("cnic", ASCENDING), ("_id", ASCENDING)], {}),
+    ("candidates", [("search_tokens", ASCENDING)], {}),
+]
+
+def ensure_index(collection, keys, options):
+    """
+    Creates one index. A TTL index whose expiry changed is updated in place
+    with collMod, since create_index refuses to change an existing index's options.
+    """
+    ttl = options.get("expireAfterSeconds")
+    if ttl is not None:
+        for index in collection.index_information().values():
+            if list(index["key"]) == keys:
+                if index.get("expireAfterSeconds") != ttl:
+                    collection.database.command({
+                        "collMod": collection.name,
+                        "index": {"keyPattern": dict(keys), "expireAfterSeconds": ttl}
+                    })
+                return
+    collection.create_index(keys, **options)
+
+def ensure_indexes():
+    """
+    Creates the indexes the query paths rely on. Safe to call repeatedly.
+
+    Each index is created on its own, so one that fails does not hold back the
+    rest. Never called on the request path: it runs on the warm-up thread
+    (retried every WARMUP_POLL_SECONDS while any index is missing), at startup
+    under `python app.py`, and from `flask ensure-indexes` for deployments.
+
+    Returns:
+        list: The indexes that could not be put in place, with the error for each.
+    """
+    failed = []
+    for collection, keys, options in REQUIRED_INDEXES:
+        fields = [field for field, _ in keys]
+        try:
+            ensure_index(mongo.db[collection], keys, options)
+        except PyMongoError as error:
+            app.logger.warning("Index %s on %s could not be created: %s", fields, collection, error)
+            failed.append({"collection": collection, "keys": fields, "error": str(error)})
+    return failed
+
+@app.cli.command("ensure-indexes")
+def ensure_indexes_command():
+    """Create the MongoDB indexes used by the application."""
+    failed = ensure_indexes()
+    if failed:
+        raise click.ClickException("; ".join(
+            f"{index['collection']} {index['keys']}: {index['error']}" for index in failed
+        ))
+    click.echo("Indexes are in place.")
+
+# Admission Control
+class AdmissionController:
+    """
+    Bounds concurrent requests per route and per worker.
+
+    Requests that cannot start immediately wait in a bounded queue ordered by
+    route priority. When the queue is full, a higher-priority arrival displaces
+    the newest lower-priority waiter; otherwise the arrival is rejected at once.
+    """
+
+    def __init__(self, max_concurrency, max_queue, queue_timeout):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._condition = threading.Condition()
+        self._routes = {}
+        self._waiting = []
+        self._sequence = itertools.count()
+        self._in_flight = 0
+
+    def register(self, route, limit, priority):
+        self._routes[route] = {
+            "limit": limit, "priority": priority, "in_flight": 0,
+            "admitted": 0, "queued": 0, "rejected": 0, "shed": 0, "timed_out": 0
+        }
+
+    def _can_start(self, route):
+        state = self._routes[route]
+        return state["in_flight"] < state["limit"] and self._in_flight < self.max_concurrency
+
+    def _next_waiter(self):
+        eligible = [waiter for waiter in self._waiting if self._can_start(waiter["route"])]
+        return min(eligible, key=lambda waiter: (-waiter["priority"], waiter["sequence"]), default=None)
+
+    def _start(self, route):
+        self._routes[route]["in_flight"] += 1
+        self._routes[route]["admitted"] += 1
+        self._in_flight += 1
+
+    def acquire(self, route):
+        """
+        Returns True once the request may run, or False if it was rejected or shed.
+        """
+        state = self._routes[route]
+        with self._condition:
+            if self._can_start(route) and self._next_waiter() is None:
+                self._start(route)
+                return True
+
+            if len(self._waiting) >= self.max_queue:
+                victims = [waiter for waiter in self._waiting if waiter["priority"] < state["priority"]]
+                if not victims:
+                    state["rejected"] += 1
+                    return False
+                victim = min(victims, key=lambda waiter: (waiter["priority"], -waiter["sequence"]))
+                victim["shed"] = True
+                self._waiting.remove(victim)
+                self._condition.notify_all()
+
+            waiter = {"route": route, "priority": state["priority"], "sequence": next(self._sequence), "shed": False}
+            self._waiting.append(waiter)
+            state["queued"] += 1
+            deadline = time.monotonic() + self.queue_timeout
+
+            while True:
+                if waiter["shed"]:
+                    state["shed"] += 1
+                    return False
+                if self._next_waiter() is waiter:
+                    self._waiting.remove(waiter)
+                    self._start(route)
+                    self._condition.notify_all()
+                    return True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._waiting.remove(waiter)
+                    state["timed_out"] += 1
+                    self._condition.notify_all()
+                    return False
+                self._condition.wait(remaining)
+
+    def release(self, route):
+        with self._condition:
+            self._routes[route]["in_flight"] -= 1
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    def stats(self):
+        with self._condition:
+            return {
+                "in_flight": self._in_flight,
+                "queued": len(self._waiting),
+                "max_concurrency": self.max_concurrency,
+                "max_queue": self.max_queue,
+                "routes": {route: dict(state) for route, state in self._routes.items()}
+            }
+
+class SessionRateLimiter:
+    """
+    Token bucket per (route, session), kept in a bounded LRU.
+    """
+
+    def __init__(self, rate, burst, max_sessions=100000):
+        self.rate = rate
+        self.burst = burst
+        self.max_sessions = max_sessions
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+        self.limited = 0
+
+    def allow(self, key):
+        """
+        Returns (allowed, seconds until the next token is available).
+        """
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            else:
+                self.limited += 1
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_sessions:
+                self._buckets.popitem(last=False)
+        return allowed, 0 if allowed else (1 - tokens) / self.rate
+
+    def stats(self):
+        with self._lock:
+            return {"tracked_sessions": len(self._buckets), "rate_limited": self.limited,
+                    "rate_per_second": self.rate, "burst": self.burst}
+
+admission = AdmissionController(
+    app.config["ADMISSION_MAX_CONCURRENCY"],
+    app.config["ADMISSION_MAX_QUEUE"],
+    app.config["ADMISSION_QUEUE_TIMEOUT"]
+)
+# Vote writes outrank results reads when both are waiting
+admission.register("cast_vote", app.config["ADMISSION_VOTE_CONCURRENCY"], priority=10)
+admission.register("get_results", app.config["ADMISSION_RESULTS_CONCURRENCY"], priority=1)
+session_limiter = SessionRateLimiter(app.config["SESSION_RATE_PER_SECOND"], app.config["SESSION_RATE_BURST"])
+
+def overloaded_response(message, status, retry_after):
+    response = format_response(False, message)
+    response.status_code = status
+    response.headers["Retry-After"] = str(max(1, math.ceil(retry_after)))
+    return response
+
+def admission_controlled(route):
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            user = session.get('user') or {}
+            allowed, retry_after = session_limiter.allow((route, user.get('id') or request.remote_addr))
+            if not allowed:
+                return overloaded_response("Too many requests. Please slow down.", 429, retry_after)
+            if not admission.acquire(route):
+                return overloaded_response("Server is busy. Please try again shortly.", 503, admission.queue_timeout)
+            try:
+                return f(*args, **kwargs)
+            finally:
+                admission.release(route)
+        return decorated_function
+    return decorator
+
+@app.route('/admission_stats', methods=['GET'])
+@admin_required
+def admission_stats():
+    return format_response(True, "Admission statistics retrieved successfully.", {
+        "admission": admission.stats(),
+        "rate_limiting": session_limiter.stats()
+    })
+
+# Request Profiling
+class ProfileStore:
+    """
+    Aggregates cProfile statistics and Python/MongoDB time split per endpoint.
+    """
+
+    def __init__(self):
+        self._profiles = {}
+        self._lock = threading.Lock()
+
+    def add(self, endpoint, profiler, wall_seconds, mongo_seconds, mongo_commands):
+        with self._lock:
+            profile = self._profiles.get(endpoint)
+            if profile is None:
+                profile = self._profiles[endpoint] = {
+                    "stats": pstats.Stats(profiler), "requests": 0,
+                    "wall_seconds": 0.0, "mongo_seconds": 0.0, "mongo_commands": 0
+                }
+            else:
+                profile["stats"].add(profiler)
+            profile["requests"] += 1
+            profile["wall_seconds"] += wall_seconds
+            profile["mongo_seconds"] += mongo_seconds
+            profile["mongo_commands"] += mongo_commands
+
+    def summary(self):
+        with self._lock:
+            return {
+                endpoint: {
+                    "requests": profile["requests"],
+                    "wall_seconds": round(profile["wall_seconds"], 6),
+                    "mongo_seconds": round(profile["mongo_seconds"], 6),
+                    "python_seconds": round(max(0.0, profile["wall_seconds"] - profile["mongo_seconds"]), 6),
+                    "mongo_commands": profile["mongo_commands"]
+                }
+                for endpoint, profile in self._profiles.items()
+            }
+
+    def dump(self, endpoint):
+        """
+        Returns the endpoint's statistics in the binary pstats format, or None.
+        """
+        with self._lock:
+            profile = self._profiles.get(endpoint)
+            return marshal.dumps(profile["stats"].stats) if profile else None
+
+    def clear(self):
+        with self._lock:
+            self._profiles.clear()
+
+profiles = ProfileStore()
+
+# cProfile cannot run on two threads at once (Python 3.12+), so one request is profiled at a time
+_profiler_lock = threading.Lock()
+
+def profiling_requested():
+    header = request.headers.get('X-Profile')
+    if header:
+        token = app.config["PROFILE_TOKEN"]
+        if (token and header == token) or (session.get('user') or {}).get('role') == 'admin':
+            return True
+    sample_rate = app.config["PROFILE_SAMPLE_RATE"]
+    return sample_rate > 0 and random.random() < sample_rate
+
+@app.before_request
+def start_profiling():
+    if not profiling_requested() or not _profiler_lock.acquire(blocking=False):
+        return
+    g.profiler = cProfile.Profile()
+    g.profile_started = time.perf_counter()
+    mongo_timer.start()
+    g.profiler.enable()
+
+def stop_profiling():
+    g.profiler.disable()
+    wall_seconds = time.perf_counter() - g.profile_started
+    mongo_seconds, mongo_commands = mongo_timer.stop()
+    profiler = g.pop('profiler')
+    _profiler_lock.release()
+    # Requests that match no route share one key, so arbitrary paths cannot grow the store
+    profiles.add(request.endpoint or "<unmatched>", profiler, wall_seconds, mongo_seconds, mongo_commands)
+    return wall_seconds, mongo_seconds
+
+@app.after_request
+def finish_profiling(response):
+    if 'profiler' in g:
+        wall_seconds, mongo_seconds = stop_profiling()
+        response.headers["X-Profile-Wall-Ms"] = f"{wall_seconds * 1000:.3f}"
+        response.headers["X-Profile-Mongo-Ms"] = f"{mongo_seconds * 1000:.3f}"
+    return response
+
+@app.teardown_request
+def abandon_profiling(error=None):
+    # Unhandled exceptions skip after_request; never leave the profiler running
+    if has_app_context() and 'profiler' in g:
+        stop_profiling()
+
+@app.route('/profiles', methods=['GET'])
+@admin_required
+def list_profiles():
+    return format_response(True, "Profiles retrieved successfully.", profiles.summary())
+
+@app.route('/profiles/<endpoint>', methods=['GET'])
+@admin_required
+def download_profile(endpoint):
+    data = profiles.dump(endpoint)
+    if data is None:
+        return format_response(False, "No profile recorded for this endpoint.")
+    return Response(data, mimetype="application/octet-stream",
+                    headers={"Content-Disposition": f"attachment; filename={endpoint}.pstats"})
+
+@app.route('/profiles', methods=['DELETE'])
+@admin_required
+def reset_profiles():
+    profiles.clear()
+    return format_response(True, "Profiles cleared successfully.")
+
 # User Login
 @app.route('/login', methods=['POST'])
 def login():
@@ -92,7 +560,8 @@ def register_voter():
     if age < 18:
         return format_response(False, "Voter must be at least 18 years old.")
 
-    mongo.db.voters.insert_one({"name": name, "cnic": cnic, "dob": dob, "age": age, "voted": False})
+    mongo.db.voters.insert_one({"name": name, "cnic": cnic, "dob": dob, "age": age, "voted": False,
+                                "search_tokens": search_tokens(name)})
     return format_response(True, "Voter registered successfully.")
 
 # Get all voters
@@ -135,7 +604,7 @@ def edit_voter(voter_id):
 
     result = mongo.db.voters.update_one(
         {"_id": ObjectId(voter_id)},
-        {"$set": {"name": name, "cnic": cnic, "dob": dob, "age": age}}
+        {"$set": {"name": name, "cnic": cnic, "dob": dob, "age": age, "search_tokens": search_tokens(name)}}
     )
     if result.matched_count == 0:
         return format_response(False, "Voter not found.")
@@ -172,7 +641,8 @@ def add_candidate():
     if mongo.db.candidates.find_one({"cnic": cnic, "dob": dob}):
         return format_response(False, "Candidate already exists.")
 
-    mongo.db.candidates.insert_one({"name": name, "party": party, "cnic": cnic, "dob": dob, "age": age})
+    mongo.db.candidates.insert_one({"name": name, "party": party, "cnic": cnic, "dob": dob, "age": age,
+                                    "search_tokens": search_tokens(name, party)})
     return format_response(True, "Candidate added successfully.")
 
 @app.route('/edit_candidate/<candidate_id>', methods=['PUT'])
@@ -195,7 +665,8 @@ def edit_candidate(candidate_id):
 
     result = mongo.db.candidates.update_one(
         {"_id": ObjectId(candidate_id)},
-        {"$set": {"name": name, "party": party, "cnic": cnic, "dob": dob, "age": age}}
+        {"$set": {"name": name, "party": party, "cnic": cnic, "dob": dob, "age": age,
+                  "search_tokens": search_tokens(name, party)}}
     )
     if result.matched_count == 0:
         return format_response(False, "Candidate not found.")
@@ -241,6 +712,295 @@ def get_candidate(candidate_id):
 
 
 
+# Voter and Candidate Search
+def search_tokens(*values):
+    """
+    Lower-cased word tokens of the given values, stored on each record so that
+    name and party prefixes can be matched through an ordinary index.
+    """
+    tokens = set()
+    for value in values:
+        if value:
+            tokens.update(token for token in re.split(r"\W+", str(value).lower()) if token)
+    return sorted(tokens)
+
+def search_query(text):
+    """
+    Digits (dashes allowed, as CNICs are usually written) match a CNIC prefix;
+    anything else must prefix-match every word. Text without any word, such as
+    lone punctuation, matches everything like an empty search.
+
+    Both forms are anchored, case-sensitive regexes, which MongoDB answers
+    with a bounded index scan.
+    """
+    text = text.strip()
+    digits = text.replace("-", "")
+    if digits.isdigit():
+        return {"cnic": {"$regex": f"^{digits}"}}
+    tokens = search_tokens(text)
+    if not tokens:
+        return {}
+    return {"$and": [{"search_tokens": {"$regex": f"^{re.escape(token)}"}} for token in tokens]}
+
+def search_cursor_filter(query, after):
+    """
+    Keyset condition for the page after `after`, the `next` token of the previous page.
+
+    CNIC searches are ordered by (cnic, _id), so their token is "<cnic>:<id>";
+    all other searches are ordered by _id alone and the token is the id.
+    """
+    if "cnic" in query:
+        cnic, _, raw_id = after.rpartition(":")
+        last_id = ObjectId(raw_id)
+        return {"$or": [{"cnic": {"$gt": cnic}}, {"cnic": cnic, "_id": {"$gt": last_id}}]}
+    return {"_id": {"$gt": ObjectId(after)}}
+
+def search_collection(collection, id_field, fields):
+    """
+    Runs a prefix search with keyset pagination: pass the `next` token of one
+    page as `after` to get the following page. Results are in a stable index
+    order, so pages neither repeat nor skip records.
+    """
+    try:
+        page_size = int(request.args.get('page_size', app.config["SEARCH_PAGE_SIZE"]))
+    except ValueError:
+        return format_response(False, "Page size must be a number.")
+    page_size = min(max(1, page_size), app.config["SEARCH_MAX_PAGE_SIZE"])
+
+    query = search_query(request.args.get('q', ''))
+    sort = [("cnic", ASCENDING), ("_id", ASCENDING)] if "cnic" in query else [("_id", ASCENDING)]
+    after = request.args.get('after')
+    if after:
+        try:
+            query = {"$and": [query, search_cursor_filter(query, after)]}
+        except InvalidId:
+            return format_response(False, "Invalid search cursor.")
+
+    projection = {field: 1 for field in fields}
+    projection["cnic"] = 1
+    # One extra document tells whether another page exists without counting matches
+    documents = list(collection.find(query, projection).sort(sort).limit(page_size + 1))
+
+    results = []
+    for document in documents[:page_size]:
+        row = {id_field: str(document["_id"])}
+        row.update({field: document.get(field) for field in fields})
+        results.append(row)
+
+    next_after = None
+    if len(documents) > page_size:
+        last = documents[page_size - 1]
+        next_after = f"{last['cnic']}:{last['_id']}" if sort[0][0] == "cnic" else str(last["_id"])
+    return format_response(True, "Search completed successfully.", {
+        "results": results,
+        "page_size": page_size,
+        "has_more": next_after is not None,
+        "next": next_after
+    })
+
+@app.route('/search_voters', methods=['GET'])
+@admin_required
+def search_voters():
+    return search_collection(mongo.db.voters, "voter_id", ["name", "cnic", "dob"])
+
+@app.route('/search_candidates', methods=['GET'])
+@admin_required
+def search_candidates():
+    return search_collection(mongo.db.candidates, "candidate_id", ["name", "party", "cnic", "dob"])
+
+@app.cli.command("backfill-search")
+def backfill_search_command():
+    """Add search tokens to voters and candidates created before search existed."""
+    for collection, fields in ((mongo.db.voters, ("name",)), (mongo.db.candidates, ("name", "party"))):
+        pending = []
+        for document in collection.find({"search_tokens": {"$exists": False}}, {field: 1 for field in fields}):
+            tokens = search_tokens(*(document.get(field) for field in fields))
+            pending.append(UpdateOne({"_id": document["_id"]}, {"$set": {"search_tokens": tokens}}))
+            if len(pending) >= app.config["BULK_MAX_ITEMS"]:
+                collection.bulk_write(pending, ordered=False)
+                pending = []
+        if pending:
+            collection.bulk_write(pending, ordered=False)
+        click.echo(f"Search tokens are up to date for {collection.name}.")
+
+# Bulk Voter and Candidate Management
+def calculate_age(dob):
+    dob_date = datetime.strptime(dob, "%Y-%m-%d")
+    return (datetime.now() - dob_date).days // 365
+
+def parse_object_ids(values):
+    """
+    Maps each raw id to an ObjectId, or to None when it is not a valid id string.
+    """
+    parsed = []
+    for value in values:
+        try:
+            parsed.append(ObjectId(value) if isinstance(value, str) else None)
+        except InvalidId:
+            parsed.append(None)
+    return parsed
+
+def existing_ids(collection, object_ids):
+    ids = [object_id for object_id in object_ids if object_id is not None]
+    return {document["_id"] for document in collection.find({"_id": {"$in": ids}}, {"_id": 1})}
+
+def run_bulk_write(collection, pending):
+    """
+    Applies all (outcome, operation) pairs in one unordered bulk_write and marks
+    the outcomes of any operations the server rejected as failed.
+    """
+    if not pending:
+        return
+    try:
+        collection.bulk_write([operation for _, operation in pending], ordered=False)
+    except BulkWriteError as error:
+        for write_error in error.details.get("writeErrors", []):
+            outcome = pending[write_error["index"]][0]
+            outcome["success"] = False
+            outcome["message"] = write_error.get("errmsg", "Write failed.")
+
+def bulk_items(key):
+    body = request.json
+    if not isinstance(body, dict):
+        raise ValueError("Request body must be a JSON object.")
+    items = body.get(key)
+    if not isinstance(items, list) or not items:
+        raise ValueError(f"'{key}' must be a non-empty list.")
+    if len(items) > app.config["BULK_MAX_ITEMS"]:
+        raise ValueError(f"At most {app.config['BULK_MAX_ITEMS']} items are allowed per request.")
+    return items
+
+def bulk_edit(collection, items, id_field, label, min_age, fields):
+    """
+    Validates every edit up front, then applies the valid ones in a single bulk_write.
+
+    Returns:
+        list: One outcome per input item, in input order.
+    """
+    object_ids = parse_object_ids([item.get(id_field) if isinstance(item, dict) else None for item in items])
+    found = existing_ids(collection, object_ids)
+    outcomes, pending = [], []
+
+    for item, object_id in zip(items, object_ids):
+        if not isinstance(item, dict):
+            outcomes.append({id_field: None, "success": False, "message": "Invalid item."})
+            continue
+        outcome = {id_field: item.get(id_field), "success": False, "message": ""}
+        outcomes.append(outcome)
+        if object_id is None:
+            outcome["message"] = f"Invalid {label.lower()} id."
+            continue
+        # Every field is overwritten, so a partial item would blank out the others
+        missing = [field for field in fields if not isinstance(item.get(field), str) or not item.get(field).strip()]
+        if missing:
+            outcome["message"] = f"Missing required fields: {', '.join(missing)}."
+            continue
+        if not item['cnic'].isdigit():
+            outcome["message"] = "CNIC must be a valid number."
+            continue
+        try:
+            age = calculate_age(item.get('dob'))
+        except (ValueError, TypeError):
+            outcome["message"] = "Invalid date format. Use YYYY-MM-DD."
+            continue
+        if age < min_age:
+            outcome["message"] = f"{label} must be at least {min_age} years old."
+            continue
+        if object_id not in found:
+            outcome["message"] = f"{label} not found."
+            continue
+
+        update = {field: item.get(field) for field in fields}
+        update["age"] = age
+        update["search_tokens"] = search_tokens(update.get("name"), update.get("party"))
+        outcome["success"] = True
+        outcome["message"] = f"{label} updated successfully."
+        pending.append((outcome, UpdateOne({"_id": object_id}, {"$set": update})))
+
+    run_bulk_write(collection, pending)
+    return outcomes
+
+def bulk_delete(collection, raw_ids, id_field, label, blocked=(), blocked_message=""):
+    object_ids = parse_object_ids(raw_ids)
+    found = existing_ids(collection, object_ids)
+    outcomes, pending = [], []
+
+    for raw_id, object_id in zip(raw_ids, object_ids):
+        if not isinstance(raw_id, str):
+            outcomes.append({id_field: None, "success": False, "message": "Invalid item."})
+            continue
+        outcome = {id_field: raw_id, "success": False, "message": ""}
+        outcomes.append(outcome)
+        if object_id is None:
+            outcome["message"] = f"Invalid {label.lower()} id."
+        elif str(object_id) in blocked:
+            outcome["message"] = blocked_message
+        elif object_id not in found:
+            outcome["message"] = f"{label} not found."
+        else:
+            outcome["success"] = True
+            outcome["message"] = f"{label} deleted successfully."
+            pending.append((outcome, DeleteOne({"_id": object_id})))
+
+    run_bulk_write(collection, pending)
+    return outcomes
+
+def bulk_response(outcomes, label, action):
+    succeeded = sum(1 for outcome in outcomes if outcome["success"])
+    return format_response(succeeded > 0, f"{succeeded} of {len(outcomes)} {label} {action}.", outcomes)
+
+@app.route('/bulk_edit_voters', methods=['PUT'])
+@admin_required
+def bulk_edit_voters():
+    try:
+        items = bulk_items('voters')
+    except ValueError as error:
+        return format_response(False, str(error))
+    outcomes = bulk_edit(mongo.db.voters, items, "voter_id", "Voter", 18, ["name", "cnic", "dob"])
+    return bulk_response(outcomes, "voters", "updated")
+
+@app.route('/bulk_delete_voters', methods=['DELETE'])
+@admin_required
+def bulk_delete_voters():
+    try:
+        voter_ids = bulk_items('voter_ids')
+    except ValueError as error:
+        return format_response(False, str(error))
+    outcomes = bulk_delete(mongo.db.voters, voter_ids, "voter_id", "Voter")
+    return bulk_response(outcomes, "voters", "deleted")
+
+@app.route('/bulk_edit_candidates', methods=['PUT'])
+@admin_required
+def bulk_edit_candidates():
+    try:
+        items = bulk_items('candidates')
+    except ValueError as error:
+        return format_response(False, str(error))
+    outcomes = bulk_edit(mongo.db.candidates, items, "candidate_id", "Candidate", 25, ["name", "party", "cnic", "dob"])
+    return bulk_response(outcomes, "candidates", "updated")
+
+@app.route('/bulk_delete_candidates', methods=['DELETE'])
+@admin_required
+def bulk_delete_candidates():
+    try:
+        candidate_ids = bulk_items('candidate_ids')
+    except ValueError as error:
+        return format_response(False, str(error))
+
+    # One indexed $in query finds every candidate that is still part of an election
+    lookup = [candidate_id for candidate_id in candidate_ids if isinstance(candidate_id, str)]
+    lookup += [object_id for object_id in parse_object_ids(candidate_ids) if object_id is not None]
+    in_elections = set()
+    for election in mongo.db.elections.find({"candidates._id": {"$in": lookup}}, {"candidates._id": 1}):
+        in_elections.update(str(candidate["_id"]) for candidate in election.get("candidates", []))
+
+    outcomes = bulk_delete(
+        mongo.db.candidates, candidate_ids, "candidate_id", "Candidate",
+        blocked=in_elections,
+        blocked_message="Candidate cannot be deleted as they are part of an election."
+    )
+    return bulk_response(outcomes, "candidates", "deleted")
+
 # Election Scheduling
 @app.route('/create_election', methods=['POST'])
 @admin_required
@@ -250,10 +1010,18 @@ def create_election():
     start_date = datetime.fromisoformat(data.get('start_date'))
     end_date = datetime.fromisoformat(data.get('end_date'))
     candidate_ids = data.get('candidate_ids')
+    counter_shards = data.get('counter_shards', 1)
 
     if start_date >= end_date:
         return format_response(False, "Invalid election schedule.")
 
+    max_shards = app.config["MAX_COUNTER_SHARDS"]
+    if isinstance(counter_shards, bool) or not isinstance(counter_shards, int) or not 1 <= counter_shards <= max_shards:
+        return format_response(False, f"Counter shards must be a whole number between 1 and {max_shards}.")
+    # Sharded elections depend on the unique ballots index to reject repeat votes
+    if counter_shards > 1 and not ensure_ballot_guard():
+        return format_response(False, "Sharded elections are unavailable until the ballots index is in place.")
+
     # Check for scheduling conflicts
     conflict = mongo.db.elections.find_one({
         "$or": [
@@ -271,13 +1039,27 @@ def create_election():
         if candidate:
             candidates.append({"_id": str(candidate["_id"]), "name": candidate["name"], "party": candidate["party"]})
 
-    mongo.db.elections.insert_one({
+    election_id = mongo.db.elections.insert_one({
         "name": name,
         "start_date": start_date,
         "end_date": end_date,
         "candidates": candidates,
-        "votes": {}
-    })
+        "votes": {},
+        "counter_shards": counter_shards
+    }).inserted_id
+    if counter_shards > 1:
+        mongo.db.vote_counters.insert_many([
+            {
+                "_id": f"{election_id}:{shard}",
+                "election_id": str(election_id),
+                "shard": shard,
+                "start_date": start_date,
+                "end_date": end_date,
+                "votes": {}
+            }
+            for shard in range(counter_shards)
+        ])
+    election_cache.invalidate()
     return format_response(True, "Election created successfully.", {"candidates": candidates})
 
 @app.route('/edit_election/<election_id>', methods=['PUT'])
@@ -321,6 +1103,12 @@ def edit_election(election_id):
     )
     if result.matched_count == 0:
         return format_response(False, "Election not found.")
+    # Counter shards enforce the voting window in their own writes
+    mongo.db.vote_counters.update_many(
+        {"election_id": election_id},
+        {"$set": {"start_date": start_date, "end_date": end_date}}
+    )
+    election_cache.invalidate(election_id)
     return format_response(True, "Election updated successfully.", {"candidates": candidates})
 
 @app.route('/delete_election/<election_id>', methods=['DELETE'])
@@ -329,15 +1117,618 @@ def delete_election(election_id):
     result = mongo.db.elections.delete_one({"_id": ObjectId(election_id)})
     if result.deleted_count == 0:
         return format_response(False, "Election not found.")
+    mongo.db.ballots.delete_many({"election_id": election_id})
+    mongo.db.vote_counters.delete_many({"election_id": election_id})
+    election_cache.invalidate(election_id)
+    voted_filter.discard(election_id)
     return format_response(True, "Election deleted successfully.")
 
+# Election Cache and Warm-up
+ELECTION_FIELDS = {"name": 1, "start_date": 1, "end_date": 1, "candidates": 1, "counter_shards": 1}
+
+class ElectionCache:
+    """
+    Per-worker cache of election schedules and candidate lists.
+
+    Vote counters are never cached here. Entries expire after ELECTION_CACHE_TTL
+    seconds so that edits made through other workers are picked up.
+    """
+
+    def __init__(self, ttl_seconds):
+        self.ttl_seconds = ttl_seconds
+        self._elections = {}
+        self._schedule = None
+        self._lock = threading.Lock()
+
+    def put(self, election):
+        with self._lock:
+            self._elections[str(election["_id"])] = (time.monotonic() + self.ttl_seconds, election)
+
+    def get(self, election_id):
+        with self._lock:
+            entry = self._elections.get(election_id)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+
+        election = mongo.db.elections.find_one({"_id": ObjectId(election_id)}, ELECTION_FIELDS)
+        if election:
+            self.put(election)
+        return election
+
+    def schedule(self):
+        """
+        Returns elections that have not ended yet, ordered by start date.
+        """
+        with self._lock:
+            schedule = self._schedule
+        if schedule and schedule[0] > time.monotonic():
+            return schedule[1]
+
+        elections = list(mongo.db.elections.find(
+            {"end_date": {"$gte": datetime.now()}}, {"name": 1, "start_date": 1, "end_date": 1}
+        ).sort("start_date", ASCENDING))
+        with self._lock:
+            self._schedule = (time.monotonic() + self.ttl_seconds, elections)
+        return elections
+
+    def invalidate(self, election_id=None):
+        with self._lock:
+            if election_id:
+                self._elections.pop(election_id, None)
+            self._schedule = None
+
+    def __len__(self):
+        return len(self._elections)
+
+election_cache = ElectionCache(app.config["ELECTION_CACHE_TTL"])
+
+def warm_connection_pool(connections):
+    """
+    Opens up to `connections` pooled connections by pinging from that many threads.
+    """
+    with ThreadPoolExecutor(max_workers=connections) as pool:
+        list(pool.map(lambda _: mongo.db.command("ping"), range(connections)))
+
+def warm_election(election):
+    election_id = str(election["_id"])
+    election_cache.put(election)
+    # Reading the tally documents pulls them into the server's cache before the first vote,
+    # and the voters already recorded there seed this worker's "already voted" filter
+    tally = mongo.db.elections.find_one({"_id": election["_id"]}, {"votes": 1}) or {}
+    if election.get("counter_shards", 1) > 1:
+        list(mongo.db.vote_counters.find({"election_id": election_id}))
+        ballots = mongo.db.ballots.find({"election_id": election_id}, {"voter_id": 1, "_id": 0})
+        voted_filter.load(election_id, (ballot["voter_id"] for ballot in ballots.batch_size(app.config["EXPORT_BATCH_SIZE"])))
+    else:
+        voted_filter.load(election_id, (key for key, value in tally.get("votes", {}).items() if value is True))
+
+class WarmupScheduler(threading.Thread):
+    """
+    Background thread that keeps upcoming and running elections warm in this worker.
+
+    Every poll it refreshes the cached schedule and every election starting
+    within the lead time. Elections it has not seen before (or whose start
+    date moved) also get their tally document preloaded. On its first pass
+    it opens the connection pool, and until they all exist it creates the
+    required indexes.
+    """
+
+    def __init__(self, lead_seconds, poll_seconds, connections):
+        super().__init__(name="election-warmup", daemon=True)
+        self.lead_seconds = lead_seconds
+        self.poll_seconds = poll_seconds
+        self.connections = connections
+        self.warmed = {}
+        self.missing_indexes = None
+        self.last_run = None
+
+    def run_once(self, now=None):
+        now = now or datetime.now()
+        if self.missing_indexes is None:
+            warm_connection_pool(self.connections)
+        # A failing index is reported in status() and retried, but never holds back warm-up
+        if self.missing_indexes != []:
+            self.missing_indexes = ensure_indexes()
+
+        upcoming = mongo.db.elections.find({
+            "start_date": {"$lte": now + timedelta(seconds=self.lead_seconds)},
+            "end_date": {"$gte": now}
+        }, ELECTION_FIELDS)
+        warmed = {}
+        for election in upcoming:
+            election_id = str(election["_id"])
+            if self.warmed.get(election_id) == election["start_date"]:
+                election_cache.put(election)
+            else:
+                warm_election(election)
+            warmed[election_id] = election["start_date"]
+        self.warmed = warmed
+        voted_filter.retain(warmed)
+
+        election_cache.invalidate()
+        election_cache.schedule()
+        self.last_run = now
+
+    def run(self):
+        while True:
+            try:
+                self.run_once()
+            except PyMongoError as error:
+                app.logger.warning("Election warm-up failed: %s", error)
+            except Exception:
+                # Anything else must not kill the thread and silently stop warm-up
+                app.logger.exception("Election warm-up failed")
+            time.sleep(self.poll_seconds)
+
+    def status(self):
+        return {
+            "running": self.is_alive(),
+            "last_run": self.last_run.isoformat() if self.last_run else None,
+            "warmed_elections": sorted(self.warmed),
+            "missing_indexes": self.missing_indexes,
+            "cached_elections": len(election_cache),
+            "voted_filters": voted_filter.stats()
+        }
+
+warmup_scheduler = WarmupScheduler(
+    app.config["WARMUP_LEAD_SECONDS"],
+    app.config["WARMUP_POLL_SECONDS"],
+    app.config["WARMUP_CONNECTIONS"]
+)
+_warmup_lock = threading.Lock()
+
+@app.before_request
+def start_warmup():
+    # Started on the first request so each forked worker runs its own scheduler
+    if warmup_scheduler.is_alive() or not app.config["WARMUP_ENABLED"] or app.testing:
+        return
+    with _warmup_lock:
+        if not warmup_scheduler.is_alive() and warmup_scheduler.ident is None:
+            warmup_scheduler.start()
+
+@app.route('/warmup_status', methods=['GET'])
+@admin_required
+def warmup_status():
+    return format_response(True, "Warm-up status retrieved successfully.", warmup_scheduler.status())
+
 # Vote Casting
+ALREADY_VOTED = "Voter has already cast a vote in this election."
+
+def utc_now():
+    """Current time as a naive UTC datetime, the form MongoDB stores and TTL indexes compare."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+class IdempotencyStore:
+    """
+    Reserves client request keys and remembers the outcome of the vote they started.
+
+    A key is claimed with a pending document in the `vote_requests` collection
+    (expired by a TTL index) before the vote path runs, so a concurrent retry on
+    any worker waits for the first attempt instead of racing it. Finished outcomes
+    are also kept in a bounded in-process LRU. Each key is bound to the election
+    and candidate it was first used for. Timestamps are naive UTC, which is how
+    the TTL monitor reads them.
+    """
+
+    def __init__(self, max_entries, ttl_seconds, wait_seconds, pending_seconds):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.wait_seconds = wait_seconds
+        self.pending_seconds = pending_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _remember(self, key, fingerprint, outcome, expires_at):
+        with self._lock:
+            self._entries[key] = (expires_at, fingerprint, outcome)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _cached(self, key, now):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                self._entries.move_to_end(key)
+                return entry[1], entry[2]
+            if entry:
+                del self._entries[key]
+        return None
+
+    def _answer(self, fingerprint, stored_fingerprint, outcome):
+        if stored_fingerprint != fingerprint:
+            return (False, "Idempotency key was already used for a different vote.")
+        return outcome
+
+    def _claim(self, key, fingerprint, now):
+        try:
+            mongo.db.vote_requests.insert_one({
+                "_id": key,
+                "state": "pending",
+                "election_id": fingerprint[0],
+                "candidate_id": fingerprint[1],
+                "created_at": now
+            })
+            return True
+        except DuplicateKeyError:
+            return False
+
+    def _take_over(self, key, fingerprint, document, now):
+        """
+        Re-claims an expired record, or a pending one whose attempt died without
+        finishing. The created_at condition lets only one worker win the takeover.
+        """
+        return mongo.db.vote_requests.update_one(
+            {"_id": key, "created_at": document["created_at"]},
+            {
+                "$set": {
+                    "state": "pending",
+                    "election_id": fingerprint[0],
+                    "candidate_id": fingerprint[1],
+                    "created_at": now
+                },
+                "$unset": {"success": "", "message": ""}
+            }
+        ).modified_count == 1
+
+    def begin(self, key, election_id, candidate_id):
+        """
+        Claims `key` for a new vote attempt.
+
+        Returns:
+            tuple: (None, None) when the caller owns the key and must run the vote
+            and then call finish(); otherwise (success, message) to return as is.
+        """
+        fingerprint = (election_id, candidate_id)
+        deadline = time.monotonic() + self.wait_seconds
+        delay = 0.05
+        while True:
+            now = utc_now()
+            cached = self._cached(key, now)
+            if cached:
+                return self._answer(fingerprint, *cached)
+            if self._claim(key, fingerprint, now):
+                return None, None
+
+            document = mongo.db.vote_requests.find_one({"_id": key})
+            if document is None:
+                continue  # Removed between the insert and the read; claim again
+            age = now - document["created_at"]
+            if age > timedelta(seconds=self.ttl_seconds):
+                if self._take_over(key, fingerprint, document, now):
+                    return None, None
+                continue
+
+            stored_fingerprint = (document.get("election_id"), document.get("candidate_id"))
+            if stored_fingerprint != fingerprint:
+                return self._answer(fingerprint, stored_fingerprint, None)
+            if document.get("state") == "done":
+                outcome = (document["success"], document["message"])
+                self._remember(key, fingerprint, outcome, document["created_at"] + timedelta(seconds=self.ttl_seconds))
+                return outcome
+            if age > timedelta(seconds=self.pending_seconds):
+                if self._take_over(key, fingerprint, document, now):
+                    return None, None
+                continue
+            if time.monotonic() + delay > deadline:
+                return (False, "This vote is still being processed. Please retry shortly.")
+            time.sleep(delay)
+            delay = min(delay * 2, 0.5)
+
+    def finish(self, key, election_id, candidate_id, outcome, final):
+        """
+        Records a final outcome for `key`, or releases the claim so a retry runs
+        the vote path again.
+        """
+        if not final:
+            mongo.db.vote_requests.delete_one({"_id": key, "state": "pending"})
+            return
+        now = utc_now()
+        self._remember(key, (election_id, candidate_id), outcome, now + timedelta(seconds=self.ttl_seconds))
+        mongo.db.vote_requests.update_one(
+            {"_id": key, "state": "pending"},
+            {"$set": {"state": "done", "success": outcome[0], "message": outcome[1]}}
+        )
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+vote_outcomes = IdempotencyStore(
+    app.config["IDEMPOTENCY_CACHE_SIZE"],
+    app.config["IDEMPOTENCY_TTL_SECONDS"],
+    app.config["IDEMPOTENCY_WAIT_SECONDS"],
+    app.config["IDEMPOTENCY_PENDING_SECONDS"]
+)
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter sized for `capacity` members at `error_rate` false positives.
+    """
+
+    def __init__(self, capacity, error_rate):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, member):
+        digest = hashlib.blake2b(member.encode("utf-8"), digest_size=16).digest()
+        first, second = int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+        return [(first + index * second) % self.size for index in range(self.hashes)]
+
+    def add(self, member):
+        for position in self._positions(member):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, member):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(member))
+
+    def __len__(self):
+        return self.count
+
+class VotedFilter:
+    """
+    Per-election, in-process record of voters known to have voted.
+
+    Members are added from successful votes in this worker and bulk-loaded when
+    an election is warmed. A miss only means "not known here", so it always
+    falls through to the database. In "set" mode a hit is a definite answer; in
+    "bloom" mode a hit is only likely and must be confirmed by the database.
+
+    Memory is bounded: an election's exact set is converted to a Bloom filter
+    once it holds more than `exact_limit` voters, and at most `max_elections`
+    elections are kept, forgetting the least recently written first. Forgetting
+    is always safe, since a miss only costs a database check.
+    """
+
+    def __init__(self, mode, capacity, error_rate, exact_limit, max_elections):
+        self.exact = mode != "bloom"
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.exact_limit = exact_limit
+        self.max_elections = max_elections
+        self._elections = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _members(self, election_id):
+        members = self._elections.get(election_id)
+        if members is not None:
+            self._elections.move_to_end(election_id)
+            return members
+        members = set() if self.exact else BloomFilter(self.capacity, self.error_rate)
+        self._elections[election_id] = members
+        while len(self._elections) > self.max_elections:
+            self._elections.popitem(last=False)
+        return members
+
+    def _bound(self, election_id, members):
+        if isinstance(members, set) and len(members) > self.exact_limit:
+            bloom = BloomFilter(max(self.capacity, len(members)), self.error_rate)
+            for member in members:
+                bloom.add(member)
+            self._elections[election_id] = bloom
+
+    def add(self, election_id, voter_id):
+        with self._lock:
+            members = self._members(election_id)
+            members.add(str(voter_id))
+            self._bound(election_id, members)
+
+    def _add_many(self, election_id, voter_ids):
+        with self._lock:
+            members = self._members(election_id)
+            for voter_id in voter_ids:
+                members.add(voter_id)
+            self._bound(election_id, members)
+
+    def load(self, election_id, voter_ids, batch_size=10000):
+        # Added in batches so concurrent votes are never blocked behind a whole load
+        batch = []
+        for voter_id in voter_ids:
+            batch.append(str(voter_id))
+            if len(batch) >= batch_size:
+                self._add_many(election_id, batch)
+                batch = []
+        self._add_many(election_id, batch)
+
+    def might_contain(self, election_id, voter_id):
+        members = self._elections.get(election_id)
+        return members is not None and str(voter_id) in members
+
+    def is_exact(self, election_id):
+        """True when a hit for this election is a definite answer."""
+        return isinstance(self._elections.get(election_id), set)
+
+    def discard(self, election_id):
+        with self._lock:
+            self._elections.pop(election_id, None)
+
+    def retain(self, election_ids):
+        with self._lock:
+            for election_id in set(self._elections) - set(election_ids):
+                del self._elections[election_id]
+
+    def stats(self):
+        with self._lock:
+            return {election_id: len(members) for election_id, members in self._elections.items()}
+
+voted_filter = VotedFilter(
+    app.config["VOTED_FILTER_MODE"],
+    app.config["VOTED_FILTER_CAPACITY"],
+    app.config["VOTED_FILTER_ERROR_RATE"],
+    app.config["VOTED_FILTER_EXACT_LIMIT"],
+    app.config["VOTED_FILTER_MAX_ELECTIONS"]
+)
+
+def has_voted(election_id, shards, voter_id):
+    if shards > 1:
+        return mongo.db.ballots.find_one({"election_id": election_id, "voter_id": voter_id}, {"_id": 1}) is not None
+    return mongo.db.elections.find_one({"_id": ObjectId(election_id), f"votes.{voter_id}": {"$exists": True}}, {"_id": 1}) is not None
+
+def record_vote(voter_id, election_id, candidate_id):
+    """
+    Runs the vote path for one ballot.
+
+    Returns:
+        tuple: (success, message).
+    """
+    election = election_cache.get(election_id)
+    if not election:
+        return False, "Election not found."
+
+    current_time = datetime.now()
+    if current_time < election['start_date'] or current_time > election['end_date']:
+        return False, "Election is not active."
+
+    shards = election.get('counter_shards', 1)
+
+    # Check if the voter has already voted in this election. A hit in the in-process
+    # filter is final while the election's filter is exact; sharded elections otherwise
+    # rely on the ballot insert.
+    known = voted_filter.might_contain(election_id, voter_id)
+    if known and voted_filter.is_exact(election_id):
+        return False, ALREADY_VOTED
+    if (known or shards == 1) and has_voted(election_id, shards, voter_id):
+        voted_filter.add(election_id, voter_id)
+        return False, ALREADY_VOTED
+
+    # Candidates on an election's ballot cannot be deleted, so only others need a lookup
+    on_ballot = any(str(candidate['_id']) == candidate_id for candidate in election.get('candidates', []))
+    if not on_ballot and not mongo.db.candidates.find_one({"_id": ObjectId(candidate_id)}):
+        return False, "Candidate not found."
+
+    if shards > 1:
+        success, message = record_sharded_vote(election_id, shards, voter_id, candidate_id, current_time)
+        if success or message == ALREADY_VOTED:
+            voted_filter.add(election_id, voter_id)
+        return success, message
+
+    # The voter flag in the filter keeps two concurrent submissions from both being counted,
+    # and the window bounds reject an election shortened or deleted since it was cached
+    result = mongo.db.elections.update_one(
+        {
+            "_id": ObjectId(election_id),
+            f"votes.{voter_id}": {"$exists": False},
+            "start_date": {"$lte": current_time},
+            "end_date": {"$gte": current_time}
+        },
+        {"$inc": {f"votes.{candidate_id}": 1}, "$set": {f"votes.{voter_id}": True}}
+    )
+    if result.modified_count == 0:
+        success, message = rejected_vote(election_id, current_time)
+        if message == ALREADY_VOTED:
+            voted_filter.add(election_id, voter_id)
+        return success, message
+    voted_filter.add(election_id, voter_id)
+
+    # Ballot records are what the tally audit recounts from
+    try:
+        mongo.db.ballots.insert_one({
+            "election_id": election_id,
+            "voter_id": voter_id,
+            "candidate_id": candidate_id,
+            "cast_at": current_time
+        })
+    except DuplicateKeyError:
+        pass
+    return True, "Vote cast successfully."
+
+def rejected_vote(election_id, current_time):
+    """
+    Explains why a guarded vote write matched nothing: the election is gone, it is
+    no longer open, or the voter had already voted.
+    """
+    election = mongo.db.elections.find_one({"_id": ObjectId(election_id)}, {"start_date": 1, "end_date": 1})
+    if not election:
+        election_cache.invalidate(election_id)
+        return False, "Election not found."
+    if not election['start_date'] <= current_time <= election['end_date']:
+        election_cache.invalidate(election_id)
+        return False, "Election is not active."
+    return False, ALREADY_VOTED
+
+def counter_shard(voter_id, shards):
+    return zlib.crc32(str(voter_id).encode("utf-8")) % shards
+
+# Set once the unique (election_id, voter_id) ballots index is confirmed on the server
+_ballot_guard = threading.Event()
+
+def ensure_ballot_guard():
+    """
+    Confirms the unique ballots index that sharded elections rely on to reject
+    repeat votes, creating it if needed.
+
+    Returns:
+        bool: False while the index cannot be confirmed.
+    """
+    if _ballot_guard.is_set():
+        return True
+    try:
+        mongo.db.ballots.create_index([("election_id", ASCENDING), ("voter_id", ASCENDING)], unique=True)
+    except PyMongoError as error:
+        app.logger.warning("Unique ballots index could not be confirmed: %s", error)
+        return False
+    _ballot_guard.set()
+    return True
+
+def record_sharded_vote(election_id, shards, voter_id, candidate_id, current_time):
+    """
+    Vote path for elections with sharded counters.
+
+    The unique (election_id, voter_id) ballot index decides whether this is the
+    voter's first vote, and the count goes to one of the election's K counter
+    documents chosen by hashing the voter, so the election document is not written.
+    Votes are refused until that index is confirmed.
+
+    The two writes are not a transaction: concurrent transactions on one counter
+    abort each other instead of queueing, and standalone servers do not support
+    them. Counter documents carry the election window, so a counter write refused
+    for a shortened or deleted election removes its ballot again. A process that
+    dies between the two writes leaves a ballot without a count, which the tally
+    audit reports as a discrepancy.
+    """
+    if not ensure_ballot_guard():
+        return False, "Voting is temporarily unavailable. Please try again shortly."
+
+    try:
+        mongo.db.ballots.insert_one({
+            "election_id": election_id,
+            "voter_id": voter_id,
+            "candidate_id": candidate_id,
+            "cast_at": current_time
+        })
+    except DuplicateKeyError:
+        return False, ALREADY_VOTED
+
+    shard = counter_shard(voter_id, shards)
+    result = mongo.db.vote_counters.update_one(
+        {
+            "_id": f"{election_id}:{shard}",
+            "start_date": {"$lte": current_time},
+            "end_date": {"$gte": current_time}
+        },
+        {"$inc": {f"votes.{candidate_id}": 1}}
+    )
+    if result.matched_count == 0:
+        mongo.db.ballots.delete_one({"election_id": election_id, "voter_id": voter_id})
+        election_cache.invalidate(election_id)
+        election = mongo.db.elections.find_one({"_id": ObjectId(election_id)}, {"_id": 1})
+        return False, "Election is not active." if election else "Election not found."
+    return True, "Vote cast successfully."
+
 @app.route('/cast_vote', methods=['POST'])
 @login_required
+@admission_controlled("cast_vote")
 def cast_vote():
     """
     Allows a voter to cast their vote in an active election.
 
+    A client may send an `Idempotency-Key` header; the key is reserved before the
+    vote is evaluated, and retries carrying it return the original outcome. A key
+    is bound to the election and candidate it was first sent with.
+
     Returns:
         Response: JSON response indicating success or failure.
     """
@@ -349,50 +1740,94 @@ def cast_vote():
     election_id = data.get('election_id')
     candidate_id = data.get('candidate_id')
 
-    election = mongo.db.elections.find_one({"_id": ObjectId(election_id)})
-    if not election:
-        return format_response(False, "Election not found.")
+    client_key = request.headers.get('Idempotency-Key') or data.get('idempotency_key')
+    if client_key is not None and not isinstance(client_key, str):
+        return format_response(False, "Idempotency key must be a string.")
+    if client_key and len(client_key) > 128:
+        return format_response(False, "Idempotency key is too long.")
+    if not client_key:
+        return format_response(*record_vote(voter_id, election_id, candidate_id))
 
-    current_time = datetime.now()
-    if current_time < election['start_date'] or current_time > election['end_date']:
-        return format_response(False, "Election is not active.")
+    request_key = f"{voter_id}:{client_key}"
+    outcome = vote_outcomes.begin(request_key, election_id, candidate_id)
+    if outcome != (None, None):
+        return format_response(*outcome)
 
-    # Check if the voter has already voted in this election
-    if mongo.db.elections.find_one({"_id": ObjectId(election_id), f"votes.{voter_id}": {"$exists": True}}):
-        return format_response(False, "Voter has already cast a vote in this election.")
+    success, message = False, ""
+    try:
+        success, message = record_vote(voter_id, election_id, candidate_id)
+    finally:
+        # Only final outcomes are kept; transient failures release the key so a retry can succeed
+        vote_outcomes.finish(
+            request_key, election_id, candidate_id, (success, message),
+            final=success or message == ALREADY_VOTED
+        )
+    return format_response(success, message)
 
-    candidate = mongo.db.candidates.find_one({"_id": ObjectId(candidate_id)})
-    if not candidate:
-        return format_response(False, "Candidate not found.")
+# Results and Analytics
+_sharded_tallies = {}
+
+def sum_counter_shards(election_id):
+    pipeline = [
+        {"$match": {"election_id": election_id}},
+        {"$project": {"votes": {"$objectToArray": "$votes"}}},
+        {"$unwind": "$votes"},
+        {"$group": {"_id": "$votes.k", "votes": {"$sum": "$votes.v"}}}
+    ]
+    return {row["_id"]: row["votes"] for row in mongo.db.vote_counters.aggregate(pipeline)}
+
+def stored_tallies(election, fresh=False):
+    """
+    Returns the stored vote counters of an election keyed by candidate id.
 
-    mongo.db.elections.update_one(
-        {"_id": ObjectId(election_id)},
-        {"$inc": {f"votes.{candidate_id}": 1}, "$set": {f"votes.{voter_id}": True}}
-    )
-    return format_response(True, "Vote cast successfully.")
+    The election's `votes` map also holds a `True` flag per voter; those are
+    participation markers, not counters, and are left out. Elections with
+    sharded counters are summed across their counter documents, and the sum
+    is reused for RESULTS_CACHE_TTL seconds unless `fresh` is set.
+    """
+    if election.get('counter_shards', 1) == 1:
+        return {key: value for key, value in election.get('votes', {}).items() if value is not True}
+
+    election_id = str(election['_id'])
+    cached = _sharded_tallies.get(election_id)
+    if not fresh and cached and cached[0] > time.monotonic():
+        return cached[1]
+    tallies = sum_counter_shards(election_id)
+    _sharded_tallies[election_id] = (time.monotonic() + app.config["RESULTS_CACHE_TTL"], tallies)
+    return tallies
+
+def candidate_tallies(election, votes=None):
+    """
+    Returns one row per candidate in the election with their current vote count.
+    """
+    if votes is None:
+        votes = stored_tallies(election)
+    return [
+        {
+            "candidate_id": str(candidate['_id']),
+            "name": candidate['name'],
+            "party": candidate['party'],
+            "votes": votes.get(str(candidate['_id']), 0)
+        }
+        for candidate in election.get('candidates', [])
+    ]
 
-# Results and Analytics
 @app.route('/get_results/<election_id>', methods=['GET'])
 @login_required
+@admission_controlled("get_results")
 def get_results(election_id):
     election = mongo.db.elections.find_one({"_id": ObjectId(election_id)})
     if not election:
         return format_response(False, "Election not found.")
 
-    votes = election.get('votes', {})
+    votes = stored_tallies(election)
     if not votes:
         return format_response(True, "No votes have been cast yet.", {"results": [], "winner": None})
 
-    candidates = election.get('candidates', [])
-    results = []
-    for candidate in candidates:
-        candidate_id = str(candidate['_id'])
-        candidate_votes = votes.get(candidate_id, 0)
-        results.append({
-            "name": candidate['name'],
-            "party": candidate['party'],
-            "votes": candidate_votes
-        })
+    results = [
+        {"name": row["name"], "party": row["party"], "votes": row["votes"]}
+        for row in candidate_tallies(election, votes)
+    ]
 
 
     max_votes = max(results, key=lambda x: x['votes'])['votes']
@@ -412,7 +1847,7 @@ def get_results(election_id):
 @login_required
 def available_elections():
     current_time = datetime.now()
-    elections = mongo.db.elections.find({"start_date": {"$lte": current_time}, "end_date": {"$gte": current_time}})
+    elections = [election for election in election_cache.schedule() if election["start_date"] <= current_time <= election["end_date"]]
     election_list = [{"election_id": str(election["_id"]), "name": election["name"]} for election in elections]
     return format_response(True, "Available elections retrieved successfully.", election_list)
 
@@ -439,6 +1874,478 @@ def get_election(election_id):
     }
     return format_response(True, "Election details retrieved successfully.", election_data)
 
+# Tally Audit
+def count_ballots(db, election_id, lower=None, upper=None):
+    """
+    Counts the ballots of one election per candidate within [lower, upper) of `_id`.
+    """
+    query = {"election_id": election_id}
+    id_range = {}
+    if lower:
+        id_range["$gte"] = lower
+    if upper:
+        id_range["$lt"] = upper
+    if id_range:
+        query["_id"] = id_range
+
+    pipeline = [{"$match": query}, {"$group": {"_id": "$candidate_id", "votes": {"$sum": 1}}}]
+    return {row["_id"]: row["votes"] for row in db.ballots.aggregate(pipeline)}
+
+def count_ballot_range(mongo_uri, election_id, lower, upper):
+    """
+    Process pool entry point; every worker process opens its own client.
+    """
+    client = MongoClient(mongo_uri)
+    try:
+        return count_ballots(client.get_default_database(), election_id, lower, upper)
+    finally:
+        client.close()
+
+def ballot_partitions(election_id, partitions, until):
+    """
+    Splits the election's ballot ids below `until` into contiguous ranges by
+    ObjectId timestamp.
+
+    The first range is open-ended and the last ends at `until`, so every ballot
+    before the cutoff falls in exactly one range.
+    """
+    bounds = []
+    for direction in (ASCENDING, DESCENDING):
+        ballot = mongo.db.ballots.find_one(
+            {"election_id": election_id, "_id": {"$lt": until}}, {"_id": 1}, sort=[("_id", direction)]
+        )
+        if not ballot:
+            return []
+        bounds.append(ballot["_id"].generation_time)
+
+    first, last = bounds
+    step = (last - first) / partitions
+    splits = sorted({ObjectId.from_datetime(first + step * index) for index in range(1, partitions)})
+    edges = [None] + [split for split in splits if split < until] + [until]
+    return list(zip(edges[:-1], edges[1:]))
+
+def recount_ballots(election_id, workers, until):
+    if workers <= 1:
+        return Counter(count_ballots(mongo.db, election_id, upper=until))
+
+    # Several ranges per worker keep the pool busy when ballots cluster in time
+    ranges = ballot_partitions(election_id, workers * 4, until)
+    totals = Counter()
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = [
+            pool.submit(count_ballot_range, app.config["MONGO_URI"], election_id, lower, upper)
+            for lower, upper in ranges
+        ]
+        for future in futures:
+            totals.update(future.result())
+    return totals
+
+def audit_election(election_id, workers=1, snapshot=False):
+    """
+    Recounts an election from its ballot records and reconciles the result
+    against the stored counters.
+
+    The counters are read right after a whole-second cutoff, and only ballots
+    created before the cutoff are recounted, so auditing an open election does
+    not flag the votes cast while the recount runs. Votes landing in the moment
+    between the cutoff and the counter read can still show as a difference.
+
+    Returns:
+        dict: The reconciliation report, or None if the election does not exist.
+    """
+    election_key = ObjectId(election_id)
+    # Ballot ids carry whole-second UTC timestamps, so the cutoff is the next second boundary
+    now = datetime.now(timezone.utc)
+    cutoff_time = now.replace(microsecond=0) + timedelta(seconds=1)
+    time.sleep((cutoff_time - now).total_seconds())
+
+    election = mongo.db.elections.find_one({"_id": election_key})
+    if not election:
+        return None
+
+    stored = stored_tallies(election, fresh=True)
+    cutoff = ObjectId.from_datetime(cutoff_time)
+    recounted = recount_ballots(election_id, workers, cutoff)
+    if election.get('counter_shards', 1) > 1:
+        # Sharded elections record participation only as ballots
+        participation = mongo.db.ballots.count_documents({"election_id": election_id, "_id": {"$lt": cutoff}})
+    else:
+        participation = sum(1 for value in election.get('votes', {}).values() if value is True)
+    names = {str(candidate['_id']): candidate['name'] for candidate in election.get('candidates', [])}
+
+    candidates = []
+    for candidate_id in sorted(set(names) | set(stored) | set(recounted)):
+        candidates.append({
+            "candidate_id": candidate_id,
+            "name": names.get(candidate_id),
+            "stored": stored.get(candidate_id, 0),
+            "recounted": recounted.get(candidate_id, 0),
+            "difference": stored.get(candidate_id, 0) - recounted.get(candidate_id, 0)
+        })
+
+    ballots = sum(recounted.values())
+    report = {
+        "election_id": election_id,
+        "audited_at": datetime.now().isoformat(),
+        "cutoff": cutoff_time.isoformat(),
+        "ballots": ballots,
+        "participation": participation,
+        "stored_total": sum(stored.values()),
+        "candidates": candidates,
+        "consistent": ballots == participation == sum(stored.values())
+                      and all(row["difference"] == 0 for row in candidates)
+    }
+
+    if snapshot:
+        report["snapshot_id"] = str(mongo.db.tally_snapshots.insert_one({
+            "election_id": election_id,
+            "created_at": datetime.now(),
+            "votes": dict(recounted),
+            "report": dict(report)
+        }).inserted_id)
+    return report
+
+def clamp_audit_workers(requested):
+    return max(1, min(int(requested), app.config["AUDIT_WORKERS"]))
+
+# One audit runs at a time per worker process; further requests queue behind it
+audit_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="audit")
+
+def run_audit_job(job_id, election_id, workers, snapshot):
+    """
+    Runs a queued audit off the request path and stores its report on the job.
+    """
+    with app.app_context():
+        mongo.db.audit_jobs.update_one({"_id": job_id}, {"$set": {"state": "running", "started_at": datetime.now()}})
+        try:
+            report = audit_election(election_id, workers, snapshot)
+        except Exception as error:
+            app.logger.exception("Audit job %s failed", job_id)
+            update = {"state": "failed", "error": str(error)}
+        else:
+            if report is None:
+                update = {"state": "failed", "error": "Election not found."}
+            else:
+                update = {"state": "done", "report": report}
+        update["finished_at"] = datetime.now()
+        mongo.db.audit_jobs.update_one({"_id": job_id}, {"$set": update})
+
+@app.route('/audit_election/<election_id>', methods=['POST'])
+@admin_required
+def audit_election_route(election_id):
+    """
+    Queues an audit of the election and returns the job id to poll with GET /audit_jobs/<job_id>.
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        workers = clamp_audit_workers(data.get('workers', app.config["AUDIT_WORKERS"]))
+        found = mongo.db.elections.count_documents({"_id": ObjectId(election_id)}, limit=1)
+    except (InvalidId, TypeError, ValueError):
+        return format_response(False, "Invalid audit request.")
+    if not found:
+        return format_response(False, "Election not found.")
+
+    snapshot = bool(data.get('snapshot'))
+    job_id = mongo.db.audit_jobs.insert_one({
+        "election_id": election_id,
+        "workers": workers,
+        "snapshot": snapshot,
+        "state": "queued",
+        "created_at": datetime.now()
+    }).inserted_id
+    audit_executor.submit(run_audit_job, job_id, election_id, workers, snapshot)
+    return format_response(True, "Audit started.", {"job_id": str(job_id)})
+
+@app.route('/audit_jobs/<job_id>', methods=['GET'])
+@admin_required
+def get_audit_job(job_id):
+    try:
+        job = mongo.db.audit_jobs.find_one({"_id": ObjectId(job_id)})
+    except InvalidId:
+        return format_response(False, "Invalid job id.")
+    if not job:
+        return format_response(False, "Audit job not found.")
+
+    state = job["state"]
+    report = job.get("report")
+    if state == "done":
+        message = "Tallies are consistent." if report["consistent"] else "Tally discrepancies found."
+    elif state == "failed":
+        message = job.get("error") or "Audit failed."
+    else:
+        message = "Audit is still running."
+    return format_response(state != "failed", message, {
+        "job_id": job_id,
+        "election_id": job["election_id"],
+        "state": state,
+        "report": report
+    })
+
+@app.cli.command("audit-election")
+@click.argument("election_id")
+@click.option("--workers", type=int, default=lambda: app.config["AUDIT_WORKERS"], help="Recount processes.")
+@click.option("--snapshot", is_flag=True, help="Store the recounted tallies as a snapshot.")
+def audit_election_command(election_id, workers, snapshot):
+    """Recount an election from ballot records and print a reconciliation report."""
+    try:
+        report = audit_election(election_id, workers, snapshot)
+    except InvalidId:
+        raise click.ClickException("Invalid election id.")
+    if report is None:
+        raise click.ClickException("Election not found.")
+    click.echo(json.dumps(report, indent=2))
+
+# Data Export
+EXPORT_COLUMNS = {
+    "voters": ["voter_id", "name", "cnic", "dob"],
+    "candidates": ["candidate_id", "name", "party", "cnic", "dob"],
+    "results": ["candidate_id", "name", "party", "votes"],
+}
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+def iter_collection_rows(collection, id_column, columns, after=None, until=None):
+    """
+    Streams documents in `_id` order through a batched, projected cursor.
+
+    `after` (exclusive) and `until` (inclusive) bound the `_id` range so an
+    interrupted export can be resumed from the last id it produced.
+    """
+    id_range = {}
+    if after:
+        id_range["$gt"] = after
+    if until:
+        id_range["$lte"] = until
+    query = {"_id": id_range} if id_range else {}
+    fields = [column for column in columns if column != id_column]
+
+    cursor = collection.find(query, {field: 1 for field in fields}).sort("_id", 1)
+    for document in cursor.batch_size(app.config["EXPORT_BATCH_SIZE"]):
+        row = {id_column: str(document["_id"])}
+        row.update({field: document.get(field) for field in fields})
+        yield row
+
+def encode_rows(rows, columns, fmt):
+    """
+    Encodes rows as CSV or NDJSON, yielding text in roughly EXPORT_CHUNK_SIZE pieces.
+    """
+    chunk_size = app.config["EXPORT_CHUNK_SIZE"]
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction='ignore')
+    if fmt == "csv":
+        writer.writeheader()
+
+    for row in rows:
+        if fmt == "csv":
+            writer.writerow(row)
+        else:
+            buffer.write(json.dumps(row) + "\n")
+        if buffer.tell() >= chunk_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+def gzip_chunks(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+def build_export(dataset, fmt="csv", compress=False, after=None, until=None, election_id=None):
+    """
+    Prepares a streaming export.
+
+    Returns:
+        tuple: (generator of bytes, download filename, mimetype).
+
+    Raises:
+        ValueError: If the dataset, format, range or election is invalid.
+    """
+    if dataset not in EXPORT_COLUMNS:
+        raise ValueError("Unknown export dataset.")
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError("Export format must be csv or ndjson.")
+
+    columns = EXPORT_COLUMNS[dataset]
+    try:
+        if dataset == "results":
+            election = mongo.db.elections.find_one({"_id": ObjectId(election_id)}, {"candidates": 1, "votes": 1, "counter_shards": 1})
+            if not election:
+                raise ValueError("Election not found.")
+            rows = iter(candidate_tallies(election))
+            filename = f"results_{election_id}.{fmt}"
+        else:
+            after_id = ObjectId(after) if after else None
+            until_id = ObjectId(until) if until else None
+            rows = iter_collection_rows(mongo.db[dataset], columns[0], columns, after_id, until_id)
+            filename = f"{dataset}.{fmt}"
+    except (InvalidId, TypeError):
+        raise ValueError("Invalid id in export request.")
+
+    chunks = (chunk.encode("utf-8") for chunk in encode_rows(rows, columns, fmt))
+    if compress:
+        return gzip_chunks(chunks), filename + ".gz", "application/gzip"
+    return chunks, filename, EXPORT_FORMATS[fmt]
+
+def export_response(dataset, election_id=None):
+    try:
+        chunks, filename, mimetype = build_export(
+            dataset,
+            fmt=request.args.get('format', 'csv'),
+            compress=request.args.get('gzip') == '1',
+            after=request.args.get('after'),
+            until=request.args.get('until'),
+            election_id=election_id
+        )
+    except ValueError as error:
+        return format_response(False, str(error))
+
+    return Response(
+        stream_with_context(chunks),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
+@app.route('/export/voters', methods=['GET'])
+@admin_required
+def export_voters():
+    return export_response("voters")
+
+@app.route('/export/candidates', methods=['GET'])
+@admin_required
+def export_candidates():
+    return export_response("candidates")
+
+@app.route('/export/results/<election_id>', methods=['GET'])
+@admin_required
+def export_results(election_id):
+    return export_response("results", election_id)
+
+@app.cli.command("export")
+@click.argument("dataset", type=click.Choice(sorted(EXPORT_COLUMNS)))
+@click.option("--election-id", help="Election to export when DATASET is results.")
+@click.option("--format", "fmt", type=click.Choice(sorted(EXPORT_FORMATS)), default="csv")
+@click.option("--gzip", "compress", is_flag=True, help="Gzip the output while streaming.")
+@click.option("--after", help="Resume after this _id (exclusive).")
+@click.option("--until", help="Stop at this _id (inclusive).")
+@click.option("--output", "-o", type=click.File("wb"), default="-")
+def export_command(dataset, election_id, fmt, compress, after, until, output):
+    """Stream voters, candidates or election results to a file."""
+    try:
+        chunks, _, _ = build_export(dataset, fmt, compress, after, until, election_id)
+    except ValueError as error:
+        raise click.ClickException(str(error))
+    for chunk in chunks:
+        output.write(chunk)
+
+# Static Assets and Page Caching
+class AssetManifest:
+    """
+    Content-hashed, pre-compressed copies of the files under the static folder.
+
+    Each asset is read, hashed and gzipped once per worker, so the versioned URLs
+    can be cached by browsers forever and served without touching the disk.
+    In debug mode the manifest is rebuilt on every lookup to pick up edits.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self._assets = None
+        self._lock = threading.Lock()
+
+    def _build(self):
+        assets = {}
+        for directory, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                path = os.path.join(directory, filename)
+                name = os.path.relpath(path, self.root).replace(os.sep, "/")
+                with open(path, "rb") as asset_file:
+                    body = asset_file.read()
+                assets[name] = {
+                    "digest": hashlib.sha256(body).hexdigest()[:12],
+                    "body": body,
+                    "gzip_body": gzip.compress(body, 9),
+                    "mimetype": mimetypes.guess_type(name)[0] or "application/octet-stream"
+                }
+        return assets
+
+    def get(self, name):
+        if app.debug:
+            return self._build().get(name)
+        with self._lock:
+            if self._assets is None:
+                self._assets = self._build()
+        return self._assets.get(name)
+
+assets = AssetManifest(app.static_folder)
+
+@app.template_global()
+def asset_url(filename):
+    asset = assets.get(filename)
+    if asset is None:
+        return url_for('static', filename=filename)
+    return url_for('versioned_asset', digest=asset["digest"], filename=filename)
+
+def compressed_response(body, gzip_body, mimetype):
+    """
+    Sends the pre-compressed body when the client accepts gzip and it is smaller.
+    """
+    accepts_gzip = "gzip" in request.headers.get("Accept-Encoding", "")
+    if accepts_gzip and len(gzip_body) < len(body):
+        response = make_response(gzip_body)
+        response.headers["Content-Encoding"] = "gzip"
+    else:
+        response = make_response(body)
+    response.mimetype = mimetype
+    response.vary.add("Accept-Encoding")
+    return response
+
+@app.route('/assets/<digest>/<path:filename>')
+def versioned_asset(digest, filename):
+    asset = assets.get(filename)
+    if asset is None:
+        abort(404)
+
+    response = compressed_response(asset["body"], asset["gzip_body"], asset["mimetype"])
+    response.set_etag(asset["digest"])
+    if digest == asset["digest"]:
+        response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+    else:
+        # A stale digest still gets the current file, but must not be pinned
+        response.headers["Cache-Control"] = "no-cache"
+    return response.make_conditional(request)
+
+_rendered_pages = {}
+
+def render_cached(template_name):
+    """
+    Renders a context-free page once per worker and answers repeat visits
+    with 304 Not Modified via its ETag.
+    """
+    page = None if app.debug else _rendered_pages.get(template_name)
+    if page is None:
+        body = render_template(template_name).encode("utf-8")
+        page = {
+            "body": body,
+            "gzip_body": gzip.compress(body, 9),
+            "etag": hashlib.sha256(body).hexdigest()[:16]
+        }
+        _rendered_pages[template_name] = page
+
+    response = compressed_response(page["body"], page["gzip_body"], "text/html")
+    response.set_etag(page["etag"])
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response.make_conditional(request)
+
 def access_denied():
     """
     Renders the access denied page.
@@ -452,7 +2359,7 @@ def access_denied():
 @app.route('/admin_dashboard')
 @admin_required
 def admin_dashboard():
-    return render_template('admin_dashboard.html')
+    return render_cached('admin_dashboard.html')
 
 # Voter Dashboard
 @app.route('/voter_dashboard')
@@ -460,7 +2367,7 @@ def admin_dashboard():
 def voter_dashboard():
     if session['user']['role'] != 'voter':
         return access_denied()
-    return render_template('voter_dashboard.html')
+    return render_cached('voter_dashboard.html')
 
 @app.route('/')
 @login_required
@@ -475,6 +2382,7 @@ def login_page():
     return render_template('login.html')
 
 if __name__ == '__main__':
-    
+    with app.app_context():
+        ensure_indexes()  # Failures are logged per index
     app.run(debug=True)
     # create_admin()
@@ -1,11 +1,15 @@
 import sys
 import os
+import gzip
+import json
+import time
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
 from dotenv import load_dotenv
 from app import app, format_response, login_required, admin_required
+from app import AdmissionController, SessionRateLimiter, VotedFilter
 import pytest
 from flask import session
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from bson.objectid import ObjectId
 from flask_pymongo import PyMongo
     
@@ -426,4 +430,543 @@ def test_create_election_conflict(client):
 
     # Cleanup
     mongo.db.elections.delete_many({})
-    mongo.db.candidates.delete_one({"_id": candidate_id})
\ No newline at end of file
+    mongo.db.candidates.delete_one({"_id": candidate_id})
+
+# Data Export
+def test_export_voters_csv(client):
+    client, mongo = client  # Get client and mongo from fixture
+    voter_id = mongo.db.voters.insert_one({
+        "name": "Export Voter",
+        "cnic": "77777",
+        "dob": "2000-01-01"
+    }).inserted_id
+
+    with client.session_transaction() as sess:
+        sess['user'] = {"id": "adminImran", "role": "admin"}
+
+    response = client.get('/export/voters?format=csv')
+    assert response.status_code == 200
+    assert response.mimetype == "text/csv"
+    body = response.data.decode()
+    assert body.splitlines()[0] == "voter_id,name,cnic,dob"
+    assert f"{voter_id},Export Voter,77777,2000-01-01" in body
+
+    mongo.db.voters.delete_one({"_id": voter_id})  # Clean up
+
+
+def test_export_voters_resume_after_id(client):
+    client, mongo = client  # Get client and mongo from fixture
+    first_id = mongo.db.voters.insert_one({"name": "First", "cnic": "77778", "dob": "2000-01-01"}).inserted_id
+    second_id = mongo.db.voters.insert_one({"name": "Second", "cnic": "77779", "dob": "2000-01-01"}).inserted_id
+
+    with client.session_transaction() as sess:
+        sess['user'] = {"id": "adminImran", "role": "admin"}
+
+    response = client.get(f'/export/voters?format=ndjson&after={first_id}')
+    exported_ids = [json.loads(line)["voter_id"] for line in response.data.decode().splitlines()]
+    assert str(first_id) not in exported_ids
+    assert str(second_id) in exported_ids
+
+    mongo.db.voters.delete_many({"_id": {"$in": [first_id, second_id]}})  # Clean up
+
+
+def test_export_candidates_gzip(client):
+    client, mongo = client  # Get client and mongo from fixture
+    with client.session_transaction() as sess:
+        sess['user'] = {"id": "adminImran", "role": "admin"}
+
+    response = client.get('/export/candidates?gzip=1')
+    assert response.mimetype == "application/gzip"
+    assert gzip.decompress(response.data).decode().startswith("candidate_id,name,party,cnic,dob")
+
+
+def test_export_invalid_range(client):
+    client, mongo = client  # Get client and mongo from fixture
+    with client.session_transaction() as sess:
+        sess['user'] = {"id": "adminImran", "role": "admin"}
+
+    response = client.get('/export/voters?after=not-an-id')
+    assert response.json['success'] == False
+    assert response.json['message'] == "Invalid id in export request."
+
+
+# Bulk Management
+def test_bulk_edit_voters_mixed_outcomes(client):
+    client, mongo = client  # Get client and mongo from fixture
+    adult_id = mongo.db.voters.insert_one({"name": "Adult", "cnic": "88881", "dob": "2000-01-01"}).inserted_id
+    minor_id = mongo.db.voters.insert_one({"name": "Minor", "cnic": "88882", "dob": "2000-01-01"}).inserted_id
+
+    with client.session_transaction() as sess:
+        sess['user'] = {"id": "adminImran", "role": "admin"}
+
+    response = client.put('/bulk_edit_voters', json={"voters": [
+        {"voter_id": str(adult_id), "name": "Adult Renamed", "cnic": "88881", "dob": "1990-01-01"},
+        {"voter_id": str(minor_id), "name": "Minor", "cnic": "88882", "dob": "2015-01-01"},
+        {"voter_id": "not-an-id", "name": "Ghost", "cnic": "88883", "dob": "1990-01-01"},
+        "abc",
+        {"voter_id": str(minor_id), "dob": "1990-01-01"},
+        {"voter_id": str(minor_id), "name": "Minor", "cnic": "88-882", "dob": "1990-01-01"}
+    ]})
+    outcomes = response.json['data']
+    assert [outcome['success'] for outcome in outcomes] == [True, False, False, False, False, False]
+    assert outcomes[1]['message'] == "Voter must be at least 18 years old."
+    assert outcomes[2]['message'] == "Invalid voter id."
+    assert outcomes[3]['message'] == "Invalid item."
+    assert outcomes[4]['message'] == "Missing required fields: name, cnic."
+    assert outcomes[5]['message'] == "CNIC must be a valid number."
+
+    not_an_object = client.put('/bulk_edit_voters', json=[{"voter_id": str(adult_id)}])
+    assert not_an_object.json['message'] == "Request body must be a JSON object."
+    assert mongo.db.voters.find_one({"_id": adult_id})['name'] == "Adult Renamed"
+    assert mongo.db.voters.find_one({"_id": minor_id})['dob'] == "2000-01-01"
+
+    mongo.db.voters.delete_many({"_id": {"$in": [adult_id, minor_id]}})  # Clean up
+
+
+def test_bulk_delete_candidates_skips_election_members(client):
+    client, mongo = client  # Get client and mongo from fixture
+    member_id = mongo.db.candidates.insert_one({"name": "Member", "party": "A", "cnic": "88884", "dob": "1980-01-01"}).inserted_id
+    free_id = mongo.db.candidates.insert_one({"name": "Free", "party": "B", "cnic": "88885", "dob": "1980-01-01"}).inserted_id
+    election_id = mongo.db.elections.insert_one({
+        "name": "Bulk Election",
+        "start_date": datetime(2030, 1, 1),
+        "end_date": datetime(2030, 1, 2),
+        "candidates": [{"_id": str(member_id), "name": "Member", "party": "A"}],
+        "votes": {}
+    }).inserted_id
+
+    with client.session_transaction() as sess:
+        sess['user'] = {"id": "adminImran", "role": "admin"}
+
+    try:
+        response = client.delete('/bulk_delete_candidates', json={"candidate_ids": [str(member_id), str(free_id), 42]})
+        outcomes = response.json['data']
+        assert outcomes[2]['message'] == "Invalid item."
+        assert outcomes[0]['success'] == False
+        assert outcomes[0]['message'] == "Candidate cannot be deleted as they are part of an election."
+        assert outcomes[1]['success'] == True
+        assert mongo.db.candidates.find_one({"_id": member_id}) is not None
+        assert mongo.db.candidates.find_one({"_id": free_id}) is None
+    finally:
+        mongo.db.elections.delete_one({"_id": election_id})  # Clean up
+        mongo.db.candidates.delete_many({"_id": {"$in": [member_id, free_id]}})
+
+
+# Vote Casting
+def test_cast_vote_retry_with_idempotency_key(client):
+    client, mongo = client  # Get client and mongo from fixture
+    candidate_id = mongo.db.candidates.insert_one({"name": "Retry", "party": "R", "cnic": "99991", "dob": "1980-01-01"}).inserted_id
+    election_id = mongo.db.elections.insert_one({
+        "name": "Retry Election",
+        "start_date": datetime(2000, 1, 1),
+        "end_date": datetime(2100, 1, 1),
+        "candidates": [{"_id": str(candidate_id), "name": "Retry", "party": "R"}],
+        "votes": {}
+    }).inserted_id
+
+    with client.session_transaction() as sess:
+        sess['user'] = {"id": "retry_voter", "role": "voter"}
+
+    vote = {"election_id": str(election_id), "candidate_id": str(candidate_id)}
+    try:
+        first = client.post('/cast_vote', json=vote, headers={"Idempotency-Key": "retry-key-1"})
+        retry = client.post('/cast_vote', json=vote, headers={"Idempotency-Key": "retry-key-1"})
+        assert first.json['success'] == True
+        assert retry.json == first.json
+
+        # TTL expiry is evaluated in UTC, whatever the host's local time zone
+        record = mongo.db.vote_requests.find_one({"_id": "retry_voter:retry-key-1"})
+        assert abs(record['created_at'] - datetime.now(timezone.utc).replace(tzinfo=None)) < timedelta(minutes=1)
+
+        # The key stays bound to the election and candidate it was first sent with
+        other = client.post('/cast_vote', json={**vote, "candidate_id": "other"}, headers={"Idempotency-Key": "retry-key-1"})
+        assert other.json['message'] == "Idempotency key was already used for a different vote."
+
+        numeric = client.post('/cast_vote', json={**vote, "idempotency_key": 12345})
+        assert numeric.json['message'] == "Idempotency key must be a string."
+
+        # A new submission without the key is still rejected as a duplicate
+        again = client.post('/cast_vote', json=vote)
+        assert again.json['message'] == "Voter has already cast a vote in this election."
+        assert mongo.db.elections.find_one({"_id": election_id})['votes'][str(candidate_id)] == 1
+    finally:
+        mongo.db.elections.delete_one({"_id": election_id})  # Clean up
+        mongo.db.candidates.delete_one({"_id": candidate_id})
+        mongo.db.vote_requests.delete_many({"_id": {"$regex": "^retry_voter:"}})
+
+
+def test_cast_vote_rejected_after_election_closed_elsewhere(client):
+    client, mongo = client  # Get client and mongo from fixture
+    from app import election_cache, voted_filter
+    candidate_id = mongo.db.candidates.insert_one({"name": "Closed", "party": "C", "cnic": "99994", "dob": "1980-01-01"}).inserted_id
+    election_id = mongo.db.elections.insert_one({
+        "name": "Closed Election",
+        "start_date": datetime(2000, 1, 1),
+        "end_date": datetime(2100, 1, 1),
+        "candidates": [{"_id": str(candidate_id), "name": "Closed", "party": "C"}],
+        "votes": {}
+    }).inserted_id
+
+    with client.session_transaction() as sess:
+        sess['user'] = {"id": "closed_voter", "role": "voter"}
+
+    try:
+        # Cache the open election, then close it without invalidating this worker's cache
+        assert election_cache.get(str(election_id)) is not None
+        mongo.db.elections.update_one({"_id": election_id}, {"$set": {"end_date": datetime(2001, 1, 1)}})
+        response = client.post('/cast_vote', json={"election_id": str(election_id), "candidate_id": str(candidate_id)})
+        assert response.json['message'] == "Election is not active."
+        assert mongo.db.elections.find_one({"_id": election_id})['votes'] == {}
+        assert not voted_filter.might_contain(str(election_id), "closed_voter")
+    finally:
+        mongo.db.elections.delete_one({"_id": election_id})  # Clean up
+        mongo.db.candidates.delete_one({"_id": candidate_id})
+
+
+
+# Admission Control
+def test_admission_controller_rejects_when_queue_full():
+    controller = AdmissionController(max_concurrency=1, max_queue=0, queue_timeout=0.1)
+    controller.register("get_results", limit=1, priority=1)
+    assert controller.acquire("get_results") == True
+    assert controller.acquire("get_results") == False
+    controller.release("get_results")
+    assert controller.acquire("get_results") == True
+    stats = controller.stats()
+    assert stats['routes']['get_results']['rejected'] == 1
+    assert stats['routes']['get_results']['admitted'] == 2
+
+
+def test_admission_controller_queue_times_out():
+    controller = AdmissionController(max_concurrency=1, max_queue=4, queue_timeout=0.05)
+    controller.register("cast_vote", limit=1, priority=10)
+    assert controller.acquire("cast_vote") == True
+    assert controller.acquire("cast_vote") == False
+    assert controller.stats()['routes']['cast_vote']['timed_out'] == 1
+
+
+def test_session_rate_limiter_burst():
+    limiter = SessionRateLimiter(rate=0.001, burst=2)
+    assert limiter.allow("voter")[0] == True
+    assert limiter.allow("voter")[0] == True
+    allowed, retry_after = limiter.allow("voter")
+    assert allowed == False
+    assert retry_after > 0
+    assert limiter.allow("other_voter")[0] == True
+
+
+# Static Assets
+def test_versioned_asset_is_immutable(client):
+    client, mongo = client  # Get client and mongo from fixture
+    with app.test_request_context():
+        url = app.jinja_env.globals['asset_url']('js/voter_dashboard.js')
+    assert url.startswith('/assets/')
+
+    response = client.get(url, headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers['Cache-Control'] == "public, max-age=31536000, immutable"
+    assert response.headers['Content-Encoding'] == "gzip"
+    assert b"cast_vote" in gzip.decompress(response.data)
+
+
+def test_dashboard_revalidates_with_etag(client):
+    client, mongo = client  # Get client and mongo from fixture
+    with client.session_transaction() as sess:
+        sess['user'] = {"id": "voter123", "role": "voter"}
+
+    response = client.get('/voter_dashboard')
+    assert response.status_code == 200
+    assert '/assets/' in response.data.decode()
+
+    cached = client.get('/voter_dashboard', headers={"If-None-Match": response.headers['ETag']})
+    assert cached.status_code == 304
+
+
+# Tally Audit
+def wait_for_audit(client, response):
+    job_id = response.json['data']['job_id']
+    for _ in range(200):
+        job = client.get(f'/audit_jobs/{job_id}')
+        if job.json['data']['state'] in ("done", "failed"):
+            return job
+        time.sleep(0.05)
+    raise AssertionError("Audit job did not finish")
+
+def test_audit_election_detects_tampered_counter(client):
+    client, mongo = client  # Get client and mongo from fixture
+    candidate_id = mongo.db.candidates.insert_one({"name": "Audit", "party": "A", "cnic": "99992", "dob": "1980-01-01"}).inserted_id
+    election_id = mongo.db.elections.insert_one({
+        "name": "Audit Election",
+        "start_date": datetime(2000, 1, 1),
+        "end_date": datetime(2100, 1, 1),
+        "candidates": [{"_id": str(candidate_id), "name": "Audit", "party": "A"}],
+        "votes": {}
+    }).inserted_id
+
+    try:
+        with client.session_transaction() as sess:
+            sess['user'] = {"id": "audit_voter", "role": "voter"}
+        vote = client.post('/cast_vote', json={"election_id": str(election_id), "candidate_id": str(candidate_id)})
+        assert vote.json['success'] == True
+
+        with client.session_transaction() as sess:
+            sess['user'] = {"id": "adminImran", "role": "admin"}
+        # A ballot created after the audit's cutoff is left for the next audit
+        mongo.db.ballots.insert_one({
+            "_id": ObjectId.from_datetime(datetime.now(timezone.utc) + timedelta(hours=1)),
+            "election_id": str(election_id),
+            "voter_id": "late_voter",
+            "candidate_id": str(candidate_id)
+        })
+        response = wait_for_audit(client, client.post(f'/audit_election/{election_id}', json={"workers": 1}))
+        assert response.json['data']['report']['consistent'] == True
+        assert response.json['data']['report']['ballots'] == 1
+        assert 'cutoff' in response.json['data']['report']
+
+        mongo.db.elections.update_one({"_id": election_id}, {"$inc": {f"votes.{candidate_id}": 5}})
+        response = wait_for_audit(client, client.post(f'/audit_election/{election_id}', json={"workers": 1}))
+        assert response.json['message'] == "Tally discrepancies found."
+        assert response.json['data']['report']['candidates'][0]['difference'] == 5
+    finally:
+        mongo.db.elections.delete_one({"_id": election_id})  # Clean up
+        mongo.db.candidates.delete_one({"_id": candidate_id})
+        mongo.db.ballots.delete_many({"election_id": str(election_id)})
+        mongo.db.audit_jobs.delete_many({"election_id": str(election_id)})
+
+
+# Request Profiling
+def test_profile_requested_by_admin_header(client):
+    client, mongo = client  # Get client and mongo from fixture
+    with client.session_transaction() as sess:
+        sess['user'] = {"id": "adminImran", "role": "admin"}
+
+    client.delete('/profiles')
+    unprofiled = client.get('/get_voters')
+    assert 'X-Profile-Wall-Ms' not in unprofiled.headers
+
+    profiled = client.get('/get_voters', headers={"X-Profile": "1"})
+    assert float(profiled.headers['X-Profile-Wall-Ms']) >= float(profiled.headers['X-Profile-Mongo-Ms'])
+
+    summary = client.get('/profiles').json['data']
+    assert summary['get_voters']['requests'] == 1
+    assert summary['get_voters']['mongo_commands'] >= 1
+
+    download = client.get('/profiles/get_voters')
+    assert download.mimetype == "application/octet-stream"
+    assert len(download.data) > 0
+
+
+# Election Warm-up
+def test_warmup_preloads_upcoming_election(client):
+    client, mongo = client  # Get client and mongo from fixture
+    from app import warmup_scheduler, election_cache
+
+    now = datetime.now()
+    upcoming_id = mongo.db.elections.insert_one({
+        "name": "Warm Election",
+        "start_date": now + timedelta(seconds=30),
+        "end_date": now + timedelta(hours=1),
+        "candidates": [],
+        "votes": {}
+    }).inserted_id
+    distant_id = mongo.db.elections.insert_one({
+        "name": "Distant Election",
+        "start_date": now + timedelta(days=30),
+        "end_date": now + timedelta(days=31),
+        "candidates": [],
+        "votes": {}
+    }).inserted_id
+
+    try:
+        warmup_scheduler.run_once()
+        status = warmup_scheduler.status()
+        assert str(upcoming_id) in status['warmed_elections']
+        assert str(distant_id) not in status['warmed_elections']
+        assert status['missing_indexes'] == []
+        assert election_cache.get(str(upcoming_id))['name'] == "Warm Election"
+    finally:
+        mongo.db.elections.delete_many({"_id": {"$in": [upcoming_id, distant_id]}})  # Clean up
+        election_cache.invalidate(str(upcoming_id))
+
+
+# Search
+def test_search_voters_by_name_and_cnic_prefix(client):
+    client, mongo = client  # Get client and mongo from fixture
+    with client.session_transaction() as sess:
+        sess['user'] = {"id": "adminImran", "role": "admin"}
+
+    mongo.db.voters.delete_many({"cnic": "5550001112223"})
+    client.post('/register_voter', json={"name": "Zainab Searchable", "cnic": "5550001112223", "dob": "1995-05-05"})
+
+    try:
+        by_name = client.get('/search_voters?q=SEARCHA').json['data']
+        assert [voter['cnic'] for voter in by_name['results']] == ["5550001112223"]
+
+        by_cnic = client.get('/search_voters?q=5550001').json['data']
+        assert by_cnic['results'][0]['name'] == "Zainab Searchable"
+        assert by_cnic['has_more'] == False
+
+        dashed = client.get('/search_voters?q=55500-0111').json['data']
+        assert dashed['results'][0]['cnic'] == "5550001112223"
+
+        punctuation = client.get("/search_voters?q=-'").json
+        assert punctuation['success'] == True
+
+        nothing = client.get('/search_voters?q=zainab nobody').json['data']
+        assert nothing['results'] == []
+    finally:
+        mongo.db.voters.delete_many({"cnic": "5550001112223"})  # Clean up
+
+
+def test_search_candidates_by_party_paginates(client):
+    client, mongo = client  # Get client and mongo from fixture
+    with client.session_transaction() as sess:
+        sess['user'] = {"id": "adminImran", "role": "admin"}
+
+    for index in range(3):
+        client.post('/add_candidate', json={
+            "name": f"Paged Candidate {index}",
+            "party": "Quokka Alliance",
+            "cnic": f"666000{index}",
+            "dob": "1970-01-01"
+        })
+
+    try:
+        first_page = client.get('/search_candidates?q=quokka&page_size=2').json['data']
+        second_page = client.get(f"/search_candidates?q=quokka&page_size=2&after={first_page['next']}").json['data']
+        assert len(first_page['results']) == 2
+        assert first_page['has_more'] == True
+        assert len(second_page['results']) == 1
+        assert second_page['has_more'] == False
+        assert second_page['next'] is None
+
+        # CNIC searches page through (cnic, _id) with a composite cursor
+        by_cnic = client.get('/search_candidates?q=666000&page_size=2').json['data']
+        rest = client.get(f"/search_candidates?q=666000&page_size=2&after={by_cnic['next']}").json['data']
+        cnics = [candidate['cnic'] for candidate in by_cnic['results'] + rest['results']]
+        assert cnics == ["6660000", "6660001", "6660002"]
+
+        invalid = client.get('/search_candidates?q=quokka&after=not-a-cursor').json
+        assert invalid['message'] == "Invalid search cursor."
+    finally:
+        mongo.db.candidates.delete_many({"party": "Quokka Alliance"})  # Clean up
+
+
+# Sharded Vote Counters
+def test_sharded_election_counts_votes_across_shards(client):
+    client, mongo = client  # Get client and mongo from fixture
+    candidate_id = mongo.db.candidates.insert_one({"name": "Sharded", "party": "S", "cnic": "99993", "dob": "1980-01-01"}).inserted_id
+
+    with client.session_transaction() as sess:
+        sess['user'] = {"id": "adminImran", "role": "admin"}
+
+    # Created in a far-off window so it cannot conflict with other elections, then opened
+    response = client.post('/create_election', json={
+        "name": "Sharded Election",
+        "start_date": "2091-01-01 00:00:00",
+        "end_date": "2091-01-02 00:00:00",
+        "candidate_ids": [str(candidate_id)],
+        "counter_shards": 4
+    })
+    assert response.json['success'] == True
+    election_id = str(mongo.db.elections.find_one({"name": "Sharded Election", "start_date": datetime(2091, 1, 1)})["_id"])
+    window = {"start_date": datetime.now() - timedelta(hours=1), "end_date": datetime.now() + timedelta(hours=1)}
+    mongo.db.elections.update_one({"_id": ObjectId(election_id)}, {"$set": window})
+    mongo.db.vote_counters.update_many({"election_id": election_id}, {"$set": window})
+
+    try:
+        assert mongo.db.vote_counters.count_documents({"election_id": election_id}) == 4
+        for voter in ("shard_voter_1", "shard_voter_2", "shard_voter_3", "shard_voter_1"):
+            with client.session_transaction() as sess:
+                sess['user'] = {"id": voter, "role": "voter"}
+            response = client.post('/cast_vote', json={"election_id": election_id, "candidate_id": str(candidate_id)})
+        assert response.json['message'] == "Voter has already cast a vote in this election."
+
+        # Votes never touch the election document in sharded mode
+        assert mongo.db.elections.find_one({"_id": ObjectId(election_id)})['votes'] == {}
+
+        results = client.get(f'/get_results/{election_id}').json['data']
+        assert results['results'][0]['votes'] == 3
+    finally:
+        mongo.db.elections.delete_one({"_id": ObjectId(election_id)})  # Clean up
+        mongo.db.vote_counters.delete_many({"election_id": election_id})
+        mongo.db.ballots.delete_many({"election_id": election_id})
+        mongo.db.candidates.delete_one({"_id": candidate_id})
+
+
+def test_create_election_rejects_invalid_counter_shards(client):
+    client, mongo = client  # Get client and mongo from fixture
+    with client.session_transaction() as sess:
+        sess['user'] = {"id": "adminImran", "role": "admin"}
+
+    response = client.post('/create_election', json={
+        "name": "Bad Shards",
+        "start_date": "2031-01-01 00:00:00",
+        "end_date": "2031-01-02 00:00:00",
+        "candidate_ids": [],
+        "counter_shards": 0
+    })
+    assert response.json['success'] == False
+    assert response.json['message'] == "Counter shards must be a whole number between 1 and 64."
+
+
+
+# Already-voted Filter
+def test_voted_filter_exact_mode():
+    voted = VotedFilter("set", capacity=100, error_rate=0.01, exact_limit=100, max_elections=8)
+    voted.load("election_1", ["voter_1", "voter_2"])
+    voted.add("election_1", "voter_3")
+    assert voted.might_contain("election_1", "voter_3") == True
+    assert voted.might_contain("election_1", "voter_4") == False
+    assert voted.might_contain("election_2", "voter_1") == False
+    voted.discard("election_1")
+    assert voted.might_contain("election_1", "voter_1") == False
+
+
+def test_voted_filter_bloom_mode_has_no_false_negatives():
+    voted = VotedFilter("bloom", capacity=1000, error_rate=0.01, exact_limit=100, max_elections=8)
+    voted.load("election_1", (f"voter_{index}" for index in range(1000)))
+    assert voted.exact == False
+    assert all(voted.might_contain("election_1", f"voter_{index}") for index in range(1000))
+    false_positives = sum(voted.might_contain("election_1", f"stranger_{index}") for index in range(1000))
+    assert false_positives < 50
+
+
+def test_voted_filter_stays_bounded():
+    voted = VotedFilter("set", capacity=1000, error_rate=0.01, exact_limit=10, max_elections=2)
+    voted.load("election_1", (f"voter_{index}" for index in range(50)))
+    assert voted.is_exact("election_1") == False
+    assert all(voted.might_contain("election_1", f"voter_{index}") for index in range(50))
+
+    voted.add("election_2", "voter_1")
+    voted.add("election_3", "voter_1")
+    assert voted.is_exact("election_3") == True
+    assert set(voted.stats()) == {"election_2", "election_3"}
+
+
+def test_repeat_vote_rejected_from_filter(client):
+    client, mongo = client  # Get client and mongo from fixture
+    from app import voted_filter
+    candidate_id = mongo.db.candidates.insert_one({"name": "Filter", "party": "F", "cnic": "99994", "dob": "1980-01-01"}).inserted_id
+    election_id = mongo.db.elections.insert_one({
+        "name": "Filter Election",
+        "start_date": datetime(2000, 1, 1),
+        "end_date": datetime(2100, 1, 1),
+        "candidates": [{"_id": str(candidate_id), "name": "Filter", "party": "F"}],
+        "votes": {}
+    }).inserted_id
+
+    with client.session_transaction() as sess:
+        sess['user'] = {"id": "filter_voter", "role": "voter"}
+
+    vote = {"election_id": str(election_id), "candidate_id": str(candidate_id)}
+    try:
+        assert client.post('/cast_vote', json=vote).json['success'] == True
+        assert voted_filter.might_contain(str(election_id), "filter_voter") == True
+        repeat = client.post('/cast_vote', json=vote)
+        assert repeat.json['message'] == "Voter has already cast a vote in this election."
+    finally:
+        mongo.db.elections.delete_one({"_id": election_id})  # Clean up
+        mongo.db.candidates.delete_one({"_id": candidate_id})
+        mongo.db.ballots.delete_many({"election_id": str(election_id)})
+        voted_filter.discard(str(election_id))
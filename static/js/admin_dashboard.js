@@ -0,0 +1,522 @@
+document.addEventListener("DOMContentLoaded", () => {
+    // Redirect to login page if no user is logged in
+    const userRole = sessionStorage.getItem("userRole");
+    if (!userRole) {
+        window.location.href = "/login_page";
+        return;
+    }
+
+    // Handle logout
+    document.getElementById("logoutBtn").addEventListener("click", () => {
+        sessionStorage.removeItem("userRole");
+        window.location.href = "/login_page";
+    });
+
+    // Handle voter registration
+    document.getElementById("voterForm").addEventListener("submit", async (e) => {
+        e.preventDefault();
+        const name = document.getElementById("voterName").value;
+        const cnic = document.getElementById("voterCnic").value;
+        const dob = document.getElementById("voterDob").value;
+
+        const response = await fetch("/register_voter", {
+            method: "POST",
+            headers: { "Content-Type": "application/json" },
+            body: JSON.stringify({ name, cnic, dob }),
+        });
+
+        const result = await response.json();
+        alert(result.message);
+        loadVoters();
+    });
+
+    // Handle voter deletion
+    async function deleteVoter(voterId) {
+        // Show confirmation modal
+        const confirmation = confirm("Are you sure you want to delete this voter?");
+        if (!confirmation) return;
+
+        const response = await fetch(`/delete_voter/${voterId}`, {
+            method: "DELETE",
+        });
+
+        const result = await response.json();
+        alert(result.message);
+        loadVoters();
+    }
+
+    // Handle voter editing
+    async function editVoter(voterId) {
+        // Fetch voter details
+        const response = await fetch(`/get_voter/${voterId}`, { method: "GET" });
+        const result = await response.json();
+
+        if (result.success) {
+            const voter = result.data;
+
+            // Populate modal with voter details
+            document.getElementById("editVoterName").value = voter.name;
+            document.getElementById("editVoterCnic").value = voter.cnic;
+            document.getElementById("editVoterDob").value = voter.dob;
+
+            // Show modal
+            const editModal = new bootstrap.Modal(document.getElementById("editVoterModal"));
+            editModal.show();
+
+            // Handle form submission
+            document.getElementById("editVoterForm").onsubmit = async (e) => {
+                e.preventDefault();
+                const name = document.getElementById("editVoterName").value;
+                const cnic = document.getElementById("editVoterCnic").value;
+                const dob = document.getElementById("editVoterDob").value;
+
+                const updateResponse = await fetch(`/edit_voter/${voterId}`, {
+                    method: "PUT",
+                    headers: { "Content-Type": "application/json" },
+                    body: JSON.stringify({ name, cnic, dob }),
+                });
+
+                const updateResult = await updateResponse.json();
+                alert(updateResult.message);
+                loadVoters();
+                editModal.hide();
+            };
+        } else {
+            alert(result.message);
+        }
+    }
+
+    // Handle candidate addition
+    document.getElementById("candidateForm").addEventListener("submit", async (e) => {
+        e.preventDefault();
+        const name = document.getElementById("candidateName").value;
+        const party = document.getElementById("candidateParty").value;
+        const cnic = document.getElementById("candidateCnic").value;
+        const dob = document.getElementById("candidateDob").value;
+
+        const response = await fetch("/add_candidate", {
+            method: "POST",
+            headers: { "Content-Type": "application/json" },
+            body: JSON.stringify({ name, party, cnic, dob }),
+        });
+
+        const result = await response.json();
+        alert(result.message);
+        loadAllCandidates();
+    });
+
+    // Handle candidate deletion
+    async function deleteCandidate(candidateId) {
+        // Show confirmation modal
+        const confirmation = confirm("Are you sure you want to delete this candidate?");
+        if (!confirmation) return;
+
+        const response = await fetch(`/delete_candidate/${candidateId}`, {
+            method: "DELETE",
+        });
+
+        const result = await response.json();
+        alert(result.message);
+        loadAllCandidates();
+    }
+
+    // Handle candidate editing
+    async function editCandidate(candidateId) {
+        // Fetch candidate details
+        const response = await fetch(`/get_candidate/${candidateId}`, { method: "GET" });
+        const result = await response.json();
+
+        if (result.success) {
+            const candidate = result.data;
+
+            // Populate modal with candidate details
+            document.getElementById("editCandidateName").value = candidate.name;
+            document.getElementById("editCandidateParty").value = candidate.party;
+            document.getElementById("editCandidateCnic").value = candidate.cnic;
+            document.getElementById("editCandidateDob").value = candidate.dob;
+
+            // Show modal
+            const editModal = new bootstrap.Modal(document.getElementById("editCandidateModal"));
+            editModal.show();
+
+            // Handle form submission
+            document.getElementById("editCandidateForm").onsubmit = async (e) => {
+                e.preventDefault();
+                const name = document.getElementById("editCandidateName").value;
+                const party = document.getElementById("editCandidateParty").value;
+                const cnic = document.getElementById("editCandidateCnic").value;
+                const dob = document.getElementById("editCandidateDob").value;
+
+                const updateResponse = await fetch(`/edit_candidate/${candidateId}`, {
+                    method: "PUT",
+                    headers: { "Content-Type": "application/json" },
+                    body: JSON.stringify({ name, party, cnic, dob }),
+                });
+
+                const updateResult = await updateResponse.json();
+                alert(updateResult.message);
+                loadAllCandidates();
+                editModal.hide();
+            };
+        } else {
+            alert(result.message);
+        }
+    }
+
+    // Handle election scheduling
+    document.getElementById("electionForm").addEventListener("submit", async (e) => {
+        e.preventDefault();
+        const name = document.getElementById("electionName").value;
+        const startDate = document.getElementById("startDate").value;
+        const endDate = document.getElementById("endDate").value;
+        const candidateIds = Array.from(document.querySelectorAll("#candidateCheckboxes input:checked")).map(checkbox => checkbox.value);
+
+        const response = await fetch("/create_election", {
+            method: "POST",
+            headers: { "Content-Type": "application/json" },
+            body: JSON.stringify({ name, start_date: startDate, end_date: endDate, candidate_ids: candidateIds }),
+        });
+
+        const result = await response.json();
+        alert(result.message);
+        loadElections();
+    });
+
+    // Handle election editing
+    async function editElection(electionId) {
+        // Fetch election details
+        const response = await fetch(`/get_election/${electionId}`, { method: "GET" });
+        const result = await response.json();
+
+        if (result.success) {
+            const election = result.data;
+
+            // Populate modal with election details
+            document.getElementById("editElectionName").value = election.name;
+            document.getElementById("editStartDate").value = election.start_date;
+            document.getElementById("editEndDate").value = election.end_date;
+
+            // Load candidates and check the ones participating in the election
+            const candidateResponse = await fetch("/get_candidates", { method: "GET" });
+            const candidateResult = await candidateResponse.json();
+
+            if (candidateResult.success) {
+                const candidateCheckboxes = document.getElementById("editCandidateCheckboxes");
+                candidateCheckboxes.innerHTML = "";
+                candidateResult.data.forEach(candidate => {
+                    const checkbox = document.createElement("div");
+                    checkbox.className = "form-check";
+                    checkbox.innerHTML = `
+                        <input class="form-check-input" type="checkbox" value="${candidate.candidate_id}" id="edit_candidate_${candidate.candidate_id}" ${election.candidates.includes(candidate.candidate_id) ? "checked" : ""}>
+                        <label class="form-check-label" for="edit_candidate_${candidate.candidate_id}">
+                            ${candidate.name} (${candidate.party})
+                        </label>
+                    `;
+                    candidateCheckboxes.appendChild(checkbox);
+                });
+            }
+
+            else{
+                console.log("error");
+            }
+
+            // Show modal
+            const editModal = new bootstrap.Modal(document.getElementById("editElectionModal"));
+            editModal.show();
+
+            // Handle form submission
+            document.getElementById("editElectionForm").onsubmit = async (e) => {
+                e.preventDefault();
+                const name = document.getElementById("editElectionName").value;
+                const startDate = document.getElementById("editStartDate").value;
+                const endDate = document.getElementById("editEndDate").value;
+                const candidateIds = Array.from(document.querySelectorAll("#editCandidateCheckboxes input:checked")).map(checkbox => checkbox.value);
+
+                const updateResponse = await fetch(`/edit_election/${electionId}`, {
+                    method: "PUT",
+                    headers: { "Content-Type": "application/json" },
+                    body: JSON.stringify({ name, start_date: startDate, end_date: endDate, candidate_ids: candidateIds }),
+                });
+
+                const updateResult = await updateResponse.json();
+                alert(updateResult.message);
+                loadElections();
+                editModal.hide();
+            };
+        } else {
+            alert(result.message);
+        }
+    }
+
+
+    // Handle election deletion
+    async function deleteElection(electionId) {
+        const response = await fetch(`/delete_election/${electionId}`, {
+            method: "DELETE",
+        });
+
+        const result = await response.json();
+        alert(result.message);
+        loadElections();
+    }
+
+    // Handle results retrieval
+    async function loadElections() {
+        const response = await fetch("/all_elections", { method: "GET" });
+        const result = await response.json();
+
+        if (result.success) {
+            const electionsList = document.getElementById("electionsList");
+            electionsList.innerHTML = "<h6>Available Elections:</h6>";
+            result.data.forEach(election => {
+                const button = document.createElement("button");
+                button.className = "btn btn-outline-dark m-1";
+                button.textContent = election.name;
+                button.onclick = () => showResults(election.election_id);
+                electionsList.appendChild(button);
+            });
+
+            const electionList = document.getElementById("electionList");
+            electionList.innerHTML = "";
+            result.data.forEach(election => {
+                const div = document.createElement("div");
+                div.className = "d-flex justify-content-between align-items-center mb-2";
+                div.innerHTML = `
+                    <span>${election.name}</span>
+                    <div>
+                        <button class="btn btn-sm btn-primary me-2" onclick="editElection('${election.election_id}')">Edit</button>
+                        <button class="btn btn-sm btn-danger" onclick="deleteElection('${election.election_id}')">Delete</button>
+                    </div>
+                `;
+                electionList.appendChild(div);
+            });
+        } else {
+            alert(result.message);
+        }
+        if (result.data.length === 0) {
+            electionList.innerHTML = "<p class='text-center'>No elections available.</p>";
+
+        }
+    }
+    // Handle results retrieval
+    async function loadAvailableElections() {
+        const response = await fetch("/available_elections", { method: "GET" });
+        const result = await response.json();
+        document.getElementById("resultsOutput").innerHTML = "";
+
+        if (result.success) {
+            const electionsList = document.getElementById("electionsList");
+            electionsList.innerHTML = "<h6>Available Elections:</h6>";
+            result.data.forEach(election => {
+                const button = document.createElement("button");
+                button.className = "btn btn-outline-dark m-1";
+                button.textContent = election.name;
+                button.onclick = () => showResults(election.election_id);
+                electionsList.appendChild(button);
+            });
+        } else {
+            alert(result.message);
+        }
+        if (result.data.length === 0) {
+            document.getElementById("resultsOutput").innerHTML = "<p>No elections available.</p>";
+        }
+    }
+
+    async function showResults(electionId) {
+        const response = await fetch(`/get_results/${electionId}`, { method: "GET" });
+        const result = await response.json();
+
+        if (result.success) {
+            const { results, winner } = result.data;
+            if (results.length === 0) {
+                document.getElementById("resultsOutput").innerHTML = "<p>No votes have been cast yet.</p>";
+            } else {
+                let resultsTable = `
+                    <h6>Winner:</h6>
+                    <p>${winner.name} (${winner.party}) - ${winner.votes} votes</p>
+                    <h6>Results:</h6>
+                    <table class="table table-bordered">
+                        <thead>
+                            <tr>
+                                <th>Candidate Name</th>
+                                <th>Party</th>
+                                <th>Votes</th>
+                            </tr>
+                        </thead>
+                        <tbody>
+                `;
+                results.forEach(candidate => {
+                    resultsTable += `
+                        <tr>
+                            <td>${candidate.name}</td>
+                            <td>${candidate.party}</td>
+                            <td>${candidate.votes}</td>
+                        </tr>
+                    `;
+                });
+                resultsTable += `
+                        </tbody>
+                    </table>
+                `;
+                document.getElementById("resultsOutput").innerHTML = resultsTable;
+            }
+        } else {
+            alert(result.message);
+        }
+    }
+
+    //loadElections();
+
+    // Load candidates for election scheduling
+    async function loadCandidates() {
+        const response = await fetch("/get_candidates", { method: "GET" });
+        const result = await response.json();
+
+        if (result.success) {
+            const candidateCheckboxes = document.getElementById("candidateCheckboxes");
+            candidateCheckboxes.innerHTML = "";
+            result.data.forEach(candidate => {
+                const checkbox = document.createElement("div");
+                checkbox.className = "form-check";
+                checkbox.innerHTML = `
+                    <input class="form-check-input" type="checkbox" value="${candidate.candidate_id}" id="candidate_${candidate.candidate_id}">
+                    <label class="form-check-label" for="candidate_${candidate.candidate_id}">
+                        ${candidate.name} (${candidate.party})
+                    </label>
+                `;
+                candidateCheckboxes.appendChild(checkbox);
+            });
+
+            document.getElementById("selectAllCandidates").addEventListener("change", (e) => {
+                const checkboxes = document.querySelectorAll("#candidateCheckboxes input[type='checkbox']");
+                checkboxes.forEach(checkbox => checkbox.checked = e.target.checked);
+            });
+        } else {
+            alert(result.message);
+        }
+    }
+
+    // Search-backed, paginated tables: only the requested page is fetched from the server
+    function searchTable({ endpoint, inputId, listId, moreId, renderRow }) {
+        const state = { next: null, query: "", count: 0 };
+        let debounce;
+
+        async function load(reset = true) {
+            const params = new URLSearchParams({ q: state.query });
+            if (!reset && state.next) {
+                params.set("after", state.next);
+            }
+            const response = await fetch(`${endpoint}?${params}`, { method: "GET" });
+            const result = await response.json();
+
+            if (result.success) {
+                const list = document.getElementById(listId);
+                if (reset) {
+                    list.innerHTML = "";
+                    state.count = 0;
+                }
+                result.data.results.forEach((item) => {
+                    state.count += 1;
+                    const tr = document.createElement("tr");
+                    tr.innerHTML = renderRow(item, state.count);
+                    list.appendChild(tr);
+                });
+                state.next = result.data.next;
+                document.getElementById(moreId).classList.toggle("d-none", !result.data.has_more);
+            } else {
+                alert(result.message);
+            }
+        }
+
+        document.getElementById(inputId).addEventListener("input", (e) => {
+            clearTimeout(debounce);
+            debounce = setTimeout(() => {
+                state.query = e.target.value.trim();
+                load();
+            }, 250);
+        });
+        document.getElementById(moreId).addEventListener("click", () => load(false));
+        return load;
+    }
+
+    const loadAllCandidates = searchTable({
+        endpoint: "/search_candidates",
+        inputId: "candidateSearch",
+        listId: "candidateList",
+        moreId: "loadMoreCandidates",
+        renderRow: (candidate, number) => `
+            <th scope="row">${number}</th>
+            <td>${candidate.name}</td>
+            <td>${candidate.party}</td>
+            <td>${candidate.cnic}</td>
+            <td>${candidate.dob}</td>
+            <td>
+                <button class="btn btn-primary btn-sm" onclick="editCandidate('${candidate.candidate_id}')">Edit</button>
+                <button class="btn btn-danger btn-sm" onclick="deleteCandidate('${candidate.candidate_id}')">Delete</button>
+            </td>
+        `
+    });
+
+    // Handle voter list retrieval
+    const loadVoters = searchTable({
+        endpoint: "/search_voters",
+        inputId: "voterSearch",
+        listId: "voterList",
+        moreId: "loadMoreVoters",
+        renderRow: (voter, number) => `
+            <th scope="row">${number}</th>
+            <td>${voter.name}</td>
+            <td>${voter.cnic}</td>
+            <td>${voter.dob}</td>
+            <td>
+                <button class="btn btn-primary btn-sm" onclick="editVoter('${voter.voter_id}')">Edit</button>
+                <button class="btn btn-danger btn-sm" onclick="deleteVoter('${voter.voter_id}')">Delete</button>
+            </td>
+        `
+    });
+
+    document.getElementById("results-tab").addEventListener("click", () => {
+        loadAvailableElections();
+    });
+
+    document.getElementById("elections-tab").addEventListener("click", () => {
+        loadCandidates();
+    });
+
+    document.getElementById("manage-elections-tab").addEventListener("click", () => {
+
+        loadElections();
+    });
+
+    document.getElementById("candidates-tab").addEventListener("click", () => {
+        loadAllCandidates();
+    });
+
+    //reterive element id voterList and fill it with voter list
+    loadVoters();
+
+
+    //when add candidate from candidates list is clcked then open add candidate modal
+    document.getElementById("Add_candidate").addEventListener("click", () => {
+        const candidateModal = new bootstrap.Modal(document.getElementById("candidateModal"));
+        candidateModal.show();
+    });
+
+    //when add voter from voters list is clcked then open add voter modal
+    document.getElementById("Add_voter").addEventListener("click", () => {
+        const voterModal = new bootstrap.Modal(document.getElementById("voterModal"));
+        voterModal.show();
+    });
+
+    //when edit candidate from candidates list is clcked then open edit candidate modal
+    window.editCandidate = editCandidate;
+    window.deleteCandidate = deleteCandidate;
+
+    //when edit voter from voters list is clcked then open edit voter modal
+    window.editVoter = editVoter;
+    window.deleteVoter = deleteVoter;
+
+    window.editElection = editElection;
+    window.deleteElection = deleteElection;
+
+});
@@ -0,0 +1,138 @@
+document.addEventListener("DOMContentLoaded", () => {
+    // Redirect to login page if no user is logged in
+    const userRole = sessionStorage.getItem("userRole");
+    if (!userRole) {
+        window.location.href = "/login_page";
+        return;
+    }
+
+    // Handle logout
+    document.getElementById("logoutBtn").addEventListener("click", () => {
+        sessionStorage.removeItem("userRole");
+        window.location.href = "/login_page";
+    });
+
+    // Handle vote casting
+    async function loadVoteOptions() {
+        const response = await fetch("/available_elections", { method: "GET" });
+        const result = await response.json();
+
+        if (result.success) {
+            const electionSelect = document.getElementById("voteElectionId");
+            result.data.forEach(election => {
+                const option = document.createElement("option");
+                option.value = election.election_id;
+                option.textContent = election.name;
+                electionSelect.appendChild(option);
+            });
+        } else {
+            alert(result.message);
+        }
+
+        const candidateResponse = await fetch("/get_candidates", { method: "GET" });
+        const candidateResult = await candidateResponse.json();
+
+        if (candidateResult.success) {
+            const candidateSelect = document.getElementById("voteCandidateId");
+            candidateResult.data.forEach(candidate => {
+                const option = document.createElement("option");
+                option.value = candidate.candidate_id;
+                option.textContent = `${candidate.name} (${candidate.party})`;
+                candidateSelect.appendChild(option);
+            });
+        } else {
+            alert(candidateResult.message);
+        }
+    }
+
+    document.getElementById("voteForm").addEventListener("submit", async (e) => {
+        e.preventDefault();
+        const electionId = document.getElementById("voteElectionId").value;
+        const candidateId = document.getElementById("voteCandidateId").value;
+        // One key per submission so retries of this request are answered idempotently
+        const idempotencyKey = window.crypto && crypto.randomUUID
+            ? crypto.randomUUID()
+            : `${Date.now()}-${Math.random().toString(36).slice(2)}`;
+
+        const response = await fetch("/cast_vote", {
+            method: "POST",
+            headers: { "Content-Type": "application/json", "Idempotency-Key": idempotencyKey },
+            body: JSON.stringify({ election_id: electionId, candidate_id: candidateId }),
+        });
+
+        const result = await response.json();
+        alert(result.message);
+    });
+
+    loadVoteOptions();
+
+    // Handle results retrieval
+    async function loadElections() {
+        const response = await fetch("/available_elections", { method: "GET" });
+        const result = await response.json();
+        document.getElementById("resultsOutput").innerHTML = "";
+
+
+        if (result.success) {
+            const electionsList = document.getElementById("electionsList");
+            electionsList.innerHTML = "<h6>Available Elections:</h6>";
+            result.data.forEach(election => {
+                const button = document.createElement("button");
+                button.className = "btn btn-outline-dark m-1";
+                button.textContent = election.name;
+                button.onclick = () => showResults(election.election_id);
+                electionsList.appendChild(button);
+            });
+        } else {
+            alert(result.message);
+        }
+        if(result.data.length === 0){
+            document.getElementById("resultsOutput").innerHTML = "<p>No elections available.</p>";
+        }
+    }
+
+    async function showResults(electionId) {
+        const response = await fetch(`/get_results/${electionId}`, { method: "GET" });
+        const result = await response.json();
+
+        if (result.success) {
+            const { results, winner } = result.data;
+            if (results.length === 0) {
+                document.getElementById("resultsOutput").innerHTML = "<p>No votes have been cast yet.</p>";
+            } else {
+                let resultsTable = `
+                    <h6>Winner:</h6>
+                    <p>${winner.name} (${winner.party}) - ${winner.votes} votes</p>
+                    <h6>Results:</h6>
+                    <table class="table table-bordered">
+                        <thead>
+                            <tr>
+                                <th>Candidate Name</th>
+                                <th>Party</th>
+                                <th>Votes</th>
+                            </tr>
+                        </thead>
+                        <tbody>
+                `;
+                results.forEach(candidate => {
+                    resultsTable += `
+                        <tr>
+                            <td>${candidate.name}</td>
+                            <td>${candidate.party}</td>
+                            <td>${candidate.votes}</td>
+                        </tr>
+                    `;
+                });
+                resultsTable += `
+                        </tbody>
+                    </table>
+                `;
+                document.getElementById("resultsOutput").innerHTML = resultsTable;
+            }
+        } else {
+            alert(result.message);
+        }
+    }
+
+    loadElections();
+});